@@ -0,0 +1 @@
+"""Performance benchmarks for the data layer; run modules with `python -m benchmarks.<name>`."""
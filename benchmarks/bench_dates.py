@@ -0,0 +1,77 @@
+"""Benchmark date parsing: inferred format + row-wise apply vs. missions.dates.
+
+Expands the `Datum` column of the dataset to `--rows` values by sampling with
+replacement and times both code paths on the same input, then checks that
+`clean_missions` drops rows whose `Datum` cannot be parsed::
+
+    python -m benchmarks.bench_dates --rows 1000000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from missions.dates import add_date_features, parse_datum
+from missions.wrangling import clean_missions, read_raw
+
+
+def expand(series, rows, seed=0):
+    rng = np.random.default_rng(seed)
+    picks = rng.integers(0, len(series), rows)
+    return pd.Series(series.to_numpy()[picks])
+
+
+def legacy(datum):
+    df = pd.DataFrame({'Datum': datum})
+    df['date'] = pd.to_datetime(df['Datum'], infer_datetime_format=True)
+    df['year'] = df['date'].apply(lambda datetime: datetime.year)
+    df['month'] = df['date'].apply(lambda datetime: datetime.month)
+    df['weekday'] = df['date'].apply(lambda datetime: datetime.weekday())
+    return df
+
+
+def vectorized(datum):
+    df = pd.DataFrame({'Datum': datum})
+    df['date'] = parse_datum(df['Datum'])
+    return add_date_features(df)
+
+
+def check_undated(raw, bad=('garbage', None)):
+    """Clean `raw` with unparseable dates appended; returns the number of rows dropped."""
+    tail = raw.tail(len(bad)).copy()
+    tail['Datum'] = list(bad)
+    df = clean_missions(pd.concat([raw, tail], ignore_index=True))
+    assert df['date'].notna().all()
+    assert df['year'].dtype == np.int16
+    return len(raw) + len(bad) - len(df)
+
+
+def timed(func, datum):
+    start = time.perf_counter()
+    df = func(datum)
+    return time.perf_counter() - start, df
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--rows', type=int, default=1000000)
+    args = parser.parse_args()
+
+    raw = read_raw()
+    datum = expand(raw['Datum'], args.rows)
+    legacy_time, old = timed(legacy, datum)
+    new_time, new = timed(vectorized, datum)
+
+    for column in ['year', 'month', 'weekday']:
+        assert (old[column].astype(np.int64) == new[column].astype(np.int64)).all(), column
+
+    print('rows:        %d' % args.rows)
+    print('legacy:      %.3fs' % legacy_time)
+    print('vectorized:  %.3fs' % new_time)
+    print('speedup:     %.1fx' % (legacy_time / new_time))
+    print('undated:     %d rows dropped' % check_undated(raw))
+
+
+if __name__ == '__main__':
+    main()
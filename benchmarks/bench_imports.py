@@ -0,0 +1,48 @@
+"""Measure the import cost of rendering each page in a fresh interpreter.
+
+Streamlit is imported before the timer starts, since the server process has
+always loaded it by the time a script runs. `legacy` is the import block the
+single-file app.py ran on every start, whatever the page. The other rows
+import only the page registry and the selected page module::
+
+    python -m benchmarks.bench_imports
+"""
+import argparse
+import subprocess
+import sys
+
+from missions.pages import PAGES
+
+
+LEGACY_IMPORTS = (
+    'import numpy, pandas, streamlit, plotly.express, plotly.graph_objects, '
+    'plotly.subplots, iso3166, matplotlib, matplotlib.pyplot, PIL.Image'
+)
+
+TIMER = 'import time, streamlit; _t = time.perf_counter(); %s; print(time.perf_counter() - _t)'
+
+
+def import_time(statement, repeat):
+    samples = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, '-c', TIMER % statement],
+            check=True, capture_output=True, text=True
+        ).stdout
+        samples.append(float(out.split()[-1]))
+    return min(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print('%-22s %.3fs' % ('legacy (any page)', import_time(LEGACY_IMPORTS, args.repeat)))
+    for name, module in PAGES.items():
+        statement = 'import missions.pages; import %s' % module
+        print('%-22s %.3fs' % (name, import_time(statement, args.repeat)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""Benchmark the leader-per-group query: Python loop over groups vs. top_k_per_group.
+
+Builds a synthetic (group, entity, launches) table of `--rows` rows spread
+over `--groups` groups and times both implementations on it::
+
+    python -m benchmarks.bench_leaders --rows 1000000 --groups 10000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from missions.queries import top_k_per_group
+
+
+def synthetic(rows, groups, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'year': rng.integers(0, groups, rows),
+        'country': rng.integers(0, 200, rows).astype(str),
+        'launches': rng.integers(0, 500, rows),
+    })
+
+
+def legacy(ds):
+    ds = ds.sort_values(['year', 'launches'], ascending=False)
+    return pd.concat([group[1].head(1) for group in ds.groupby('year')])
+
+
+def vectorized(ds):
+    return top_k_per_group(ds, 'year', 'launches')
+
+
+def timed(func, ds):
+    start = time.perf_counter()
+    result = func(ds)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--groups', type=int, default=10000)
+    args = parser.parse_args()
+
+    ds = synthetic(args.rows, args.groups)
+    legacy_time, old = timed(legacy, ds)
+    new_time, new = timed(vectorized, ds)
+
+    old = old.sort_values('year')
+    assert (old['year'].to_numpy() == new['year'].to_numpy()).all()
+    assert (old['launches'].to_numpy() == new['launches'].to_numpy()).all()
+
+    print('rows:        %d' % args.rows)
+    print('groups:      %d' % args.groups)
+    print('legacy:      %.3fs' % legacy_time)
+    print('vectorized:  %.3fs' % new_time)
+    print('speedup:     %.1fx' % (legacy_time / new_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+"""Benchmark loading and every page's data preparation on scaled-up datasets.
+
+For each scale factor the real CSV is resampled (rows drawn with replacement,
+so the joint company, location and status distributions are preserved) into
+a temporary CSV of `scale` times as many rows. Then each stage is timed and,
+in a second run under tracemalloc, its peak memory measured:
+
+- `wrangle`: `read_missions`, i.e. reading and cleaning the CSV
+- `cube`: `build_cube` on the cleaned table
+- `load`: the app's cold load of the cube (snapshot build included)
+- one stage per page: its headless `render()`, cube already loaded, which
+  covers the page's aggregations and figure building
+
+Both runs of a stage start from the same cold state: the memoized aggregates
+(see `missions.filters.memoize_filtered`) are cleared and the forecast fits
+of the scaled dataset deleted in between, so the traced run does the same
+work as the timed one. Forecast models are fitted in worker processes,
+whose memory is not traced.
+
+A stage that raises (e.g. MemoryError) is recorded with its error and the
+remaining stages of that scale still run. Results are written as JSON for
+regression tracking::
+
+    python -m benchmarks.bench_pages --scales 10 100 1000 --output bench_pages.json
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import shutil
+import tempfile
+import time
+import tracemalloc
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from missions import charts, filters
+from missions.cube import build_cube
+from missions.forecast import fit_dir
+from missions.loader import load_cube, use_dataset
+from missions.pages import PAGES, load_page
+from missions.wrangling import DATASET_PATH, read_missions
+
+
+def scaled_csv(scale, directory, source=DATASET_PATH, seed=0):
+    """Write a CSV of `scale` times as many rows as `source`, resampled from it."""
+    raw = pd.read_csv(source, dtype=str)
+    rng = np.random.default_rng(seed)
+    sample = raw.iloc[rng.integers(0, len(raw), len(raw) * scale)].reset_index(drop=True)
+    sample.iloc[:, 0] = sample.iloc[:, 1] = np.arange(len(sample)).astype(str)
+    path = os.path.join(directory, 'missions_x%d.csv' % scale)
+    sample.to_csv(path, index=False)
+    return path, len(sample)
+
+
+def measure(func, memory=True, reset=None):
+    """Run `func` twice: timed, then traced, calling `reset` in between. Returns (seconds, peak bytes or None, error)."""
+    try:
+        start = time.perf_counter()
+        func()
+        seconds = time.perf_counter() - start
+        peak = None
+        if memory:
+            if reset is not None:
+                reset()
+            tracemalloc.start()
+            try:
+                func()
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+        return seconds, peak, None
+    except Exception as e:
+        tracemalloc.stop()
+        return None, None, '%s: %s' % (type(e).__name__, e)
+
+
+def render(page):
+    with charts.capture():
+        load_page(page).render()
+
+
+def bench_scale(scale, directory, memory=True):
+    path, rows = scaled_csv(scale, directory)
+    use_dataset(path)
+    df = None
+
+    def wrangle():
+        nonlocal df
+        df = read_missions(path)
+
+    stages = [
+        ('wrangle', wrangle),
+        ('cube', lambda: build_cube(df)),
+        ('load', lambda: load_cube(path)),
+    ] + [(page, lambda page=page: render(page)) for page in PAGES]
+
+    def reset():
+        filters.clear_memos()
+        shutil.rmtree(fit_dir(path), ignore_errors=True)
+
+    results = []
+    for stage, func in stages:
+        seconds, peak, error = measure(func, memory and stage != 'load', reset)
+        results.append({'scale': scale, 'rows': rows, 'stage': stage, 'seconds': seconds, 'peak_bytes': peak, 'error': error})
+        print('x%-6d %-22s %s' % (scale, stage, error or '%8.3fs %s' % (
+            seconds, '' if peak is None else '%9.1f MB' % (peak / 1e6)
+        )), flush=True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--scales', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--output', help='write the results as JSON to this file')
+    parser.add_argument('--no-memory', action='store_true', help='skip the traced run of each stage')
+    args = parser.parse_args()
+
+    # Pages run without a Streamlit server; silence its bare-mode warnings.
+    logging.disable(logging.WARNING)
+    warnings.filterwarnings('ignore')
+    # Import every page up front, so module imports are not timed as data prep.
+    for page in PAGES:
+        load_page(page)
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for scale in args.scales:
+            results.extend(bench_scale(scale, directory, not args.no_memory))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'pandas': pd.__version__,
+                'numpy': np.__version__,
+                'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+                'results': results,
+            }, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1 @@
+"""Data layer behind the Space Missions Analysis dashboard."""
@@ -0,0 +1,260 @@
+"""Headless HTTP API serving the dashboard's aggregates as JSON or Arrow IPC.
+
+    python -m missions.api [csv] [--port 8502] [--address 127.0.0.1]
+
+Every aggregate is computed from the same cube the pages are drawn from (see
+`missions.loader`), so the numbers match the dashboard:
+
+- ``/api/companies``: launches per company
+- ``/api/leaders?by=country|company``: the leading country or company of
+  every year by launches
+- ``/api/countries``: launches per country with its ISO alpha-3 code, as
+  drawn on the choropleth maps
+- ``/api/compare?by=country&member=India&member=USA&since=1979``: yearly
+  launches and success rates of the members (see `missions.compare`)
+- ``/api/version``: the dataset version
+
+Every aggregate accepts the sidebar filters as query arguments:
+``years=1990,2000``, and ``country``, ``company`` and ``status``, each
+repeatable, e.g. ``/api/leaders?status=Success``.
+
+Responses are JSON (pandas' ``split`` orientation) or, with ``format=arrow``
+or an ``Accept: application/vnd.apache.arrow.stream`` header, an Arrow IPC
+stream. They are cached per dataset version, aggregate, arguments and format,
+and carry an ETag derived from that key, so a client revalidating with
+If-None-Match gets a 304 without anything being computed. As in the app, the
+dataset is refreshed in the background (see `missions.refresher`).
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+
+import pyarrow as pa
+import tornado.web
+from cachetools import LRUCache
+
+from missions.compare import compare
+from missions.cube import rollup
+from missions.filters import apply_filters
+from missions.geo import country_alpha3
+from missions.loader import dataset_version, load_cube, pin_current, use_dataset, watch_dataset
+from missions.refresher import WATCH
+from missions.queries import top_k_per_group
+from missions.wrangling import DATASET_PATH
+
+
+logger = logging.getLogger(__name__)
+
+ARROW_TYPE = 'application/vnd.apache.arrow.stream'
+JSON_TYPE = 'application/json'
+
+# Query arguments of the filters and the cube columns they restrict.
+FILTER_ARGUMENTS = {
+    'country': 'country',
+    'company': 'Company Name',
+    'status': 'Status Mission',
+}
+
+# Values of `by` and the cube columns they group on.
+GROUPINGS = {
+    'country': 'country',
+    'company': 'Company Name',
+}
+
+_responses = LRUCache(maxsize=256)
+_responses_lock = threading.Lock()
+
+
+def companies(cube, args):
+    """Launches per company."""
+    data = rollup(cube, ['Company Name'])[['Company Name', 'launches']]
+    data.columns = ['company', 'launches']
+    return data
+
+
+def leaders(cube, args):
+    """The leading country or company of every year by launches."""
+    by = _grouping(args)
+    data = rollup(cube, ['year', GROUPINGS[by]])[['year', GROUPINGS[by], 'launches']]
+    data = top_k_per_group(data, 'year', 'launches')
+    data.columns = ['year', by, 'launches']
+    return data
+
+
+def countries(cube, args):
+    """Launches per country with its ISO alpha-3 code; countries without one are left out."""
+    data = rollup(cube, ['country'])
+    data['alpha3'] = country_alpha3(data['country'])
+    return data.dropna(subset=['alpha3'])[['country', 'alpha3', 'launches']]
+
+
+def comparison(cube, args):
+    """Yearly launches and success rates of the selected countries or companies."""
+    by = _grouping(args)
+    members = _list(args, 'member') or ['India', 'USA']
+    since = args.get('since')
+    try:
+        since = int(since[0]) if since else None
+    except ValueError:
+        raise tornado.web.HTTPError(400, 'since must be a year')
+    data = compare(cube, GROUPINGS[by], members, since=since)
+    return data.rename(columns={GROUPINGS[by]: by})
+
+
+AGGREGATES = {
+    'companies': companies,
+    'leaders': leaders,
+    'countries': countries,
+    'compare': comparison,
+}
+
+
+def _list(args, name):
+    # Repeated and comma-separated values alike: ?member=USA&member=India or ?member=USA,India.
+    return [value for values in args.get(name, []) for value in values.split(',') if value]
+
+
+def _grouping(args):
+    by = args.get('by', ['country'])[0]
+    if by not in GROUPINGS:
+        raise tornado.web.HTTPError(400, 'by must be one of %s' % ', '.join(GROUPINGS))
+    return by
+
+
+def parse_filters(args):
+    """The filters (as in `missions.filters.active`) given by the query arguments."""
+    filters = {}
+    if 'years' in args:
+        try:
+            low, high = (int(year) for year in args['years'][0].split(','))
+        except ValueError:
+            raise tornado.web.HTTPError(400, 'years must be two years, e.g. years=1990,2000')
+        filters['years'] = (low, high)
+    for name, column in FILTER_ARGUMENTS.items():
+        values = _list(args, name)
+        if values:
+            filters[column] = tuple(sorted(values))
+    return filters
+
+
+def encode(frame, version, kind):
+    """Serialize an aggregate as JSON or as an Arrow IPC stream."""
+    if kind == 'arrow':
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        table = table.replace_schema_metadata({**table.schema.metadata, b'missions_version': version.encode()})
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+    data = json.loads(frame.to_json(orient='split', index=False, date_format='iso'))
+    return json.dumps({'version': version, **data}, separators=(',', ':')).encode()
+
+
+def cache_key(name, args, kind, version=None):
+    return (version or dataset_version(), name, tuple(sorted((k, tuple(v)) for k, v in args.items())), kind)
+
+
+def etag(key):
+    return '"%s"' % hashlib.sha1(repr(key).encode()).hexdigest()[:20]
+
+
+def response(name, args, kind):
+    """The ETag and encoded aggregate `name` for the query `args`, cached per dataset version.
+
+    The key and the data come from one snapshot of the dataset, so a
+    version published meanwhile cannot be cached under the older key.
+    """
+    with pin_current() as snapshot:
+        key = cache_key(name, args, kind, snapshot.version)
+        with _responses_lock:
+            cached = _responses.get(key)
+        if cached is None:
+            cube = snapshot.cube
+            filters = parse_filters(args)
+            if filters:
+                cube = apply_filters(cube, filters, snapshot.version)
+            body = encode(AGGREGATES[name](cube, args), snapshot.version, kind)
+            cached = (etag(key), body)
+            with _responses_lock:
+                _responses[key] = cached
+    return cached
+
+
+class AggregateHandler(tornado.web.RequestHandler):
+
+    def compute_etag(self):
+        # ETags are set explicitly, from the cache key rather than the body.
+        return None
+
+    def _kind(self):
+        requested = self.get_query_argument('format', None)
+        if requested is None:
+            requested = 'arrow' if ARROW_TYPE in self.request.headers.get('Accept', '') else 'json'
+        if requested not in ('json', 'arrow'):
+            raise tornado.web.HTTPError(400, 'format must be json or arrow')
+        return requested
+
+    async def get(self, name):
+        if name not in AGGREGATES:
+            raise tornado.web.HTTPError(404)
+        kind = self._kind()
+        args = {
+            key: [value.decode() for value in values]
+            for key, values in self.request.query_arguments.items() if key != 'format'
+        }
+        # Only the version is needed to answer a revalidation.
+        self.set_header('ETag', etag(cache_key(name, args, kind)))
+        self.set_header('Cache-Control', 'no-cache')
+        self.set_header('Vary', 'Accept')
+        if self.check_etag_header():
+            self.set_status(304)
+            return
+
+        # Aggregates are computed off the IO loop, so one slow request does
+        # not hold up the others.
+        tag, body = await asyncio.get_running_loop().run_in_executor(None, response, name, args, kind)
+        self.set_header('ETag', tag)
+        self.set_header('Content-Type', ARROW_TYPE if kind == 'arrow' else JSON_TYPE)
+        self.write(body)
+
+
+class VersionHandler(tornado.web.RequestHandler):
+
+    def get(self):
+        self.write({'version': dataset_version()})
+
+
+def make_app():
+    return tornado.web.Application([
+        (r'/api/version', VersionHandler),
+        (r'/api/([a-z_]+)', AggregateHandler),
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('csv', nargs='?', default=DATASET_PATH, help='dataset CSV to serve')
+    parser.add_argument('--port', type=int, default=8502, help='port to listen on')
+    parser.add_argument('--address', default='127.0.0.1', help='address to listen on')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    use_dataset(args.csv)
+    if WATCH:
+        watch_dataset()
+    else:
+        load_cube()
+
+    async def serve():
+        make_app().listen(args.port, args.address)
+        logger.info('Serving %s on http://%s:%d/api/', args.csv, args.address, args.port)
+        await asyncio.Event().wait()
+
+    asyncio.run(serve())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+"""Prebuilt figures written by `missions.precompute` and loaded by the app.
+
+Artifacts are versioned by the schema version, a digest of the code that
+builds the figures and a digest of the dataset contents, so figures built
+from a copy of the CSV elsewhere (or on another machine) are picked up by any
+app running the same code on the same data, and figures built by older code
+never are::
+
+    artifacts/<schema>-<code>-<digest>/manifest.json
+    artifacts/<schema>-<code>-<digest>/<page>/<chart>.json
+
+A version directory is only used once its manifest exists, i.e. after the
+precompute job finished writing every page of it, and only if it was written
+with the installed plotly version.
+
+Only figures are precomputed. The aggregates a page computes outside its
+figure builders, e.g. `missions.eras.era_metrics`,
+`missions.compare.comparison` or `missions.forecast.forecasts` for its
+tables and captions, still run on the request path. They are memoized per
+dataset version and filters (see `missions.filters.memoize_filtered`), and
+warmed by the background refresher for each new version.
+"""
+import functools
+import hashlib
+import json
+import os
+import re
+
+import plotly
+import plotly.graph_objects as go
+
+from missions.wrangling import SCHEMA_VERSION
+
+
+ARTIFACTS_DIR = os.environ.get('MISSIONS_ARTIFACTS', os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'artifacts'
+))
+
+MANIFEST = 'manifest.json'
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+@functools.lru_cache(maxsize=16)
+def _digest(path, mtime_ns, size):
+    sha = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(functools.partial(f.read, 1 << 20), b''):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+def dataset_digest(path, version=None):
+    """SHA-1 of the dataset file, recomputed only when its mtime or size change.
+
+    With a `version` (see `missions.loader.dataset_version`), None unless
+    the file is still at that version.
+    """
+    stat = os.stat(path)
+    if version is not None and version != '%d-%d' % (stat.st_mtime_ns, stat.st_size):
+        return None
+    return _digest(path, stat.st_mtime_ns, stat.st_size)
+
+
+@functools.lru_cache(maxsize=1)
+def code_digest():
+    """SHA-1 of the sources of the `missions` package, which build every figure."""
+    sha = hashlib.sha1()
+    for directory, dirs, files in sorted(os.walk(PACKAGE_DIR)):
+        dirs.sort()
+        for name in sorted(files):
+            if name.endswith('.py'):
+                path = os.path.join(directory, name)
+                sha.update(os.path.relpath(path, PACKAGE_DIR).encode())
+                with open(path, 'rb') as f:
+                    sha.update(f.read())
+    return sha.hexdigest()
+
+
+def artifact_dir(path, root=ARTIFACTS_DIR, version=None):
+    """Directory holding the artifacts of the dataset at `path`, or None if it changed since `version`."""
+    digest = dataset_digest(path, version)
+    if digest is None:
+        return None
+    return os.path.join(root, '%d-%s-%s' % (SCHEMA_VERSION, code_digest()[:12], digest))
+
+
+def artifact_name(page, chart, **params):
+    """Path of a chart's artifact, relative to its version directory."""
+    name = chart
+    if params:
+        name += '-' + hashlib.sha1(repr(sorted(params.items())).encode()).hexdigest()[:12]
+    return os.path.join(re.sub(r'\W+', '_', page.lower()).strip('_'), name + '.json')
+
+
+def write_artifact(directory, page, chart, fig, **params):
+    path = os.path.join(directory, artifact_name(page, chart, **params))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(fig.to_json())
+    return path
+
+
+def write_manifest(directory, manifest):
+    with open(os.path.join(directory, MANIFEST), 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+
+@functools.lru_cache(maxsize=16)
+def _manifest(path, mtime_ns):
+    with open(path) as f:
+        return json.load(f)
+
+
+def read_manifest(directory):
+    """The manifest of a version directory, or None if it is not complete yet."""
+    path = os.path.join(directory, MANIFEST)
+    try:
+        return _manifest(path, os.stat(path).st_mtime_ns)
+    except (OSError, ValueError):
+        return None
+
+
+def load_artifact(path, page, chart, root=ARTIFACTS_DIR, version=None, **params):
+    """The prebuilt figure for a chart of the dataset at `path` (at `version`), or None if there is none."""
+    directory = artifact_dir(path, root, version)
+    if directory is None:
+        return None
+    manifest = read_manifest(directory)
+    if manifest is None or manifest.get('plotly') != plotly.__version__:
+        return None
+    try:
+        with open(os.path.join(directory, artifact_name(page, chart, **params))) as f:
+            spec = json.load(f)
+    except FileNotFoundError:
+        return None
+    # The JSON came out of a validated figure. Validating it again is slow
+    # and not lossless: it turns numeric `text` arrays into strings.
+    return go.Figure(spec, _validate=False)
@@ -0,0 +1,79 @@
+"""Rendering helpers shared by the dashboard pages."""
+import contextlib
+import threading
+
+import streamlit as st
+
+from missions import filters
+from missions.artifacts import load_artifact
+from missions.figcache import figure_cache, figure_key, figure_size
+from missions.loader import dataset_path, dataset_version
+from missions.payload import compact_figure, record
+from missions.profiling import stage
+
+
+_captured = None
+
+_warming = threading.local()
+
+
+@contextlib.contextmanager
+def capture():
+    """Collect the figures pages plot, as (chart, params, figure), instead of rendering them.
+
+    Used by `missions.precompute` to run pages headlessly.
+    """
+    global _captured
+    _captured = []
+    try:
+        yield _captured
+    finally:
+        _captured = None
+
+
+@contextlib.contextmanager
+def warming():
+    """Fill the figure cache with the figures pages plot from this thread, without sending them.
+
+    Used by `missions.refresher` to warm a version before publishing it.
+    """
+    _warming.active = True
+    try:
+        yield
+    finally:
+        _warming.active = False
+
+
+def _load_or_build(page, chart, build, params, version):
+    with stage('%s: load artifact' % chart):
+        fig = load_artifact(dataset_path(), page, chart, version=version, **params)
+    if fig is None:
+        with stage('%s: build figure' % chart):
+            fig = build()
+    with stage('%s: compact figure' % chart):
+        before = figure_size(fig)
+        fig = compact_figure(fig)
+        record(page, chart, before, figure_size(fig))
+    return fig
+
+
+def plot(page, chart, build, **params):
+    """Render the figure returned by `build`, reusing the cached one for this page, data version and params.
+
+    On a cache miss a figure prebuilt by `missions.precompute` for the same
+    dataset at the same version is loaded if there is one; `build` is only
+    called otherwise.
+    Either way the figure is compacted (see `missions.payload`) before it is
+    cached. The active sidebar filters are part of the cache key.
+    """
+    if _captured is not None:
+        _captured.append((chart, params, build()))
+        return
+    params = dict(params, **filters.active())
+    version = dataset_version()
+    key = figure_key(page, chart, version, **params)
+    fig = figure_cache.get_or_build(key, lambda: _load_or_build(page, chart, build, params, version))
+    if getattr(_warming, 'active', False):
+        return
+    with stage('%s: plotly_chart' % chart):
+        st.plotly_chart(fig, use_container_width=True)
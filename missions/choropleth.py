@@ -0,0 +1,145 @@
+"""Launches per country, year and mission status as one dense array, for the world maps.
+
+`launch_pivot` scatters the cube's launch counts into a year x country x
+status array in one pass (countries without an ISO alpha-3 code cannot be
+drawn and are left out). Every map is then a reduction or a slice of that
+array rather than a new groupby:
+
+- the static maps of the Geo Analysis page sum it over the years;
+- each frame of the animated map is one year of a `MAP_METRICS` metric,
+  optionally cumulative, which uses the running sum over the years that
+  the pivot computes once.
+
+Pivots are cached per dataset version and active filters, and the frames of
+each (metric, cumulative) combination on top of them, so switching between
+metrics and back costs nothing.
+"""
+import numpy as np
+import pandas as pd
+
+from missions import filters
+from missions.geo import country_alpha3
+from missions.profiling import timed
+
+
+# Metrics of the animated map and their labels.
+MAP_METRICS = {
+    'launches': 'Launches',
+    'failures': 'Failures',
+    'success_rate': 'Success rate (%)',
+}
+
+
+class LaunchPivot:
+    """Launch counts as a dense year x country x status array.
+
+    `years`, `countries`/`alpha3` and `statuses` label the three axes of
+    `counts`; every calendar year between the first and the last launch is
+    present, with zeros where nothing launched.
+    """
+
+    def __init__(self, years, countries, alpha3, statuses, counts):
+        self.years = years
+        self.countries = countries
+        self.alpha3 = alpha3
+        self.statuses = statuses
+        self.counts = counts
+        self._cumulative = None
+
+    def _counts(self, cumulative):
+        if not cumulative:
+            return self.counts
+        if self._cumulative is None:
+            self._cumulative = self.counts.cumsum(axis=0)
+        return self._cumulative
+
+    def _status(self, counts, status):
+        if status not in self.statuses:
+            return np.zeros(counts.shape[:-1], dtype=counts.dtype)
+        return counts[..., self.statuses.index(status)]
+
+    def metric(self, name, cumulative=False):
+        """Year x country array of one of `MAP_METRICS`; success rates are NaN where nothing launched."""
+        counts = self._counts(cumulative)
+        if name == 'launches':
+            return counts.sum(axis=2)
+        if name == 'failures':
+            return self._status(counts, 'Failure')
+        if name == 'success_rate':
+            launches = counts.sum(axis=2)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                return np.where(launches > 0, self._status(counts, 'Success') / launches * 100, np.nan)
+        raise ValueError('metric must be one of %s, got %r' % (', '.join(MAP_METRICS), name))
+
+    def totals(self, status=None):
+        """Launches (of one mission `status`, if given) per country over all years.
+
+        Returns the columns `country`, `alpha3` and `launches`, for the
+        countries with at least one launch, ordered by country.
+        """
+        counts = self.counts.sum(axis=0)
+        launches = counts.sum(axis=1) if status is None else self._status(counts, status)
+        present = launches > 0
+        return pd.DataFrame({
+            'country': self.countries[present],
+            'alpha3': self.alpha3[present],
+            'launches': launches[present],
+        })
+
+
+@timed('launch pivot')
+def launch_pivot(cube):
+    """The `LaunchPivot` of `cube` (or a slice of it)."""
+    categories = cube['country'].cat.categories
+    alpha3 = country_alpha3(pd.Series(categories)).to_numpy()
+    drawable = pd.notna(alpha3)
+    # Column of each country category, -1 for the trailing "missing" code
+    # and for countries without an alpha-3 code.
+    column = np.full(len(categories) + 1, -1)
+    column[:-1][drawable] = np.arange(drawable.sum())
+
+    statuses = list(cube['Status Mission'].cat.categories)
+    years = cube['year'].to_numpy()
+    first, last = (years.min(), years.max()) if len(years) else (0, -1)
+    shape = (last - first + 1, int(drawable.sum()), len(statuses))
+
+    country = column[cube['country'].cat.codes.to_numpy()]
+    rows = country >= 0
+    flat = np.ravel_multi_index(
+        (years[rows] - first, country[rows], cube['Status Mission'].cat.codes.to_numpy()[rows]), shape
+    )
+    counts = np.bincount(flat, weights=cube['launches'].to_numpy()[rows], minlength=int(np.prod(shape)))
+    return LaunchPivot(
+        years=np.arange(first, last + 1),
+        countries=np.asarray(categories[drawable], dtype=object),
+        alpha3=np.asarray(alpha3[drawable], dtype=object),
+        statuses=statuses,
+        counts=counts.astype(np.int64).reshape(shape),
+    )
+
+
+@filters.memoize_filtered(maxsize=8)
+def pivot():
+    """`launch_pivot` of the filtered cube, cached per data version and filters."""
+    return launch_pivot(filters.filtered_cube())
+
+
+@filters.memoize_filtered(maxsize=32)
+def map_frames(metric, cumulative=False):
+    """Frames of the animated map: one `go.Frame`-like dict per year, plus the color range.
+
+    Frames only carry each year's values; the locations and names are the
+    same for every frame and belong to the figure's trace (see `LaunchPivot`).
+    Cached per data version, filters, metric and mode.
+    """
+    source = pivot()
+    values = source.metric(metric, cumulative)
+    if metric == 'success_rate':
+        color_range = [0, 100]
+    else:
+        color_range = [0, max(int(values.max()) if values.size else 0, 1)]
+    frames = [
+        {'name': str(year), 'data': [{'type': 'choropleth', 'z': row}]}
+        for year, row in zip(source.years, values)
+    ]
+    return frames, color_range
@@ -0,0 +1,66 @@
+"""Side-by-side comparison of launch programs (countries or companies).
+
+`compare` computes, for every selected member and year, the number of
+launches and successes, the success rate and a rolling success rate. It
+makes one grouped pass over the cube: launches are summed per (year, member,
+success) and unstacked into columns, so no metric needs its own groupby or a
+merge with the others. `comparison` memoizes the result per dataset version,
+active filters and selection.
+"""
+import pandas as pd
+
+from missions import filters
+from missions.profiling import timed
+
+
+# Years in the rolling success rate window.
+ROLLING_YEARS = 5
+
+COMPARISON_COLUMNS = ['launches', 'successes', 'success_rate', 'rolling_success_rate']
+
+
+@timed('compare')
+def compare(cube, by, members, since=None, window=ROLLING_YEARS):
+    """Yearly launch metrics of each of `members` of the `by` dimension.
+
+    Returns one row per (year, member) with at least one launch, ordered by
+    year and member, with the columns `year`, `by` and `COMPARISON_COLUMNS`.
+    Rates are percentages. The rolling rate pools the launches of the last
+    `window` calendar years, including years without launches.
+    """
+    rows = cube[cube[by].isin(list(members))]
+    if since is not None:
+        rows = rows[rows['year'] >= since]
+    if not len(rows):
+        return pd.DataFrame(columns=['year', by] + COMPARISON_COLUMNS)
+    keys = [rows['year'], rows[by].astype(object), (rows['Status Mission'] == 'Success').rename('success')]
+    counts = rows['launches'].groupby(keys).sum().unstack('success', fill_value=0)
+    counts = counts.reindex(columns=[False, True], fill_value=0)
+
+    # Year x member tables of launches and successes, with every calendar
+    # year in the range so the rolling window counts years, not rows.
+    launches = counts.sum(axis=1).unstack(by, fill_value=0)
+    successes = counts[True].unstack(by, fill_value=0)
+    if len(launches):
+        years = range(launches.index.min(), launches.index.max() + 1)
+        launches = launches.reindex(years, fill_value=0)
+        successes = successes.reindex(years, fill_value=0)
+    rolling_launches = launches.rolling(window, min_periods=1).sum()
+    rolling_successes = successes.rolling(window, min_periods=1).sum()
+
+    result = pd.concat({
+        'launches': launches,
+        'successes': successes,
+        'success_rate': successes / launches * 100,
+        'rolling_success_rate': rolling_successes / rolling_launches * 100,
+    }, axis=1)
+    result = result.stack(by)
+    result = result[result['launches'] > 0].rename_axis(['year', by]).reset_index()
+    result[['launches', 'successes']] = result[['launches', 'successes']].astype('int64')
+    return result[['year', by] + COMPARISON_COLUMNS]
+
+
+@filters.memoize_filtered(maxsize=32)
+def comparison(by, members, since=None, window=ROLLING_YEARS):
+    """`compare` on the filtered cube, cached per data version, filters and selection."""
+    return compare(filters.filtered_cube(), by, members, since, window)
@@ -0,0 +1,85 @@
+"""Rocket cost statistics per company or per year.
+
+Prices are only known for part of the missions; unknown prices are missing
+(NA) in the missions table, never 0, so every statistic here is over the
+priced missions only and `coverage` tells how many of the launches that is.
+`cost_stats` computes all of them in one pass over the priced missions: they
+are sorted by (group, price) once, after which sums and counts are bincounts
+and every quantile is an interpolation between two positions of the sorted
+prices, so medians and quantiles cost no more than the mean.
+
+Medians and quantiles are not additive, so unlike the other measures they
+cannot be rolled up from the cube and are computed from the (filtered)
+missions table instead. `costs` memoizes them per dataset version and active
+filters.
+"""
+import numpy as np
+import pandas as pd
+
+from missions import filters
+from missions.profiling import timed
+
+
+# Quantiles reported besides the median, as column name and fraction.
+QUANTILES = {'q25': 0.25, 'q75': 0.75}
+
+COST_COLUMNS = ['launches', 'priced', 'coverage', 'sum', 'mean', 'median'] + list(QUANTILES)
+
+
+def _sorted_quantile(prices, starts, counts, q):
+    # Linearly interpolated quantile `q` of each group of the sorted prices,
+    # the same as `Series.quantile`; NaN for groups without prices.
+    result = np.full(len(counts), np.nan)
+    has = counts > 0
+    position = starts[has] + q * (counts[has] - 1)
+    low = np.floor(position).astype(np.intp)
+    high = np.ceil(position).astype(np.intp)
+    result[has] = prices[low] + (prices[high] - prices[low]) * (position - low)
+    return result
+
+
+@timed('cost stats')
+def cost_stats(missions, by):
+    """Rocket cost statistics of the missions grouped by the `by` column.
+
+    Returns one row per group with at least one launch, ordered by group and
+    indexed by it, with the columns `COST_COLUMNS`: the numbers of launches
+    and of priced launches, their ratio, the sum of the known prices (0 when
+    none is known), and their mean, median and `QUANTILES` (NaN when none
+    is known).
+    """
+    values = missions[by]
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        codes, labels = values.cat.codes.to_numpy(), values.cat.categories
+    else:
+        codes, labels = pd.factorize(values, sort=True)
+    prices = missions['Rocket'].to_numpy(dtype=np.float64, na_value=np.nan)
+    rows = codes >= 0
+    codes, prices = codes[rows], prices[rows]
+
+    launches = np.bincount(codes, minlength=len(labels))
+    priced = ~np.isnan(prices)
+    group, price = codes[priced], prices[priced]
+    order = np.lexsort((price, group))
+    group, price = group[order], price[order]
+    counts = np.bincount(group, minlength=len(labels))
+    starts = np.cumsum(counts) - counts
+    sums = np.bincount(group, weights=price, minlength=len(labels))
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        result = pd.DataFrame({
+            'launches': launches,
+            'priced': counts,
+            'coverage': counts / launches,
+            'sum': sums,
+            'mean': np.where(counts > 0, sums / counts, np.nan),
+            'median': _sorted_quantile(price, starts, counts, 0.5),
+            **{name: _sorted_quantile(price, starts, counts, q) for name, q in QUANTILES.items()},
+        }, index=pd.Index(np.asarray(labels), name=by))
+    return result[launches > 0]
+
+
+@filters.memoize_filtered(maxsize=16)
+def costs(by):
+    """`cost_stats` of the filtered missions, cached per data version and filters."""
+    return cost_stats(filters.filtered_missions(), by)
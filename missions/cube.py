@@ -0,0 +1,102 @@
+"""Aggregate cube shared by the dashboard pages.
+
+Every chart in the app is a roll-up of launch counts and prices over some of
+the dimensions below. The cube stores the additive measures once per distinct
+combination of dimensions, so a page only ever groups over the cube, never
+over the raw missions table:
+
+- `launches`: number of missions
+- `rocket_sum`: total known rocket price of those missions
+- `priced`: number of missions with a known price
+- `first_launch` / `last_launch`: earliest and latest launch date
+
+Means are derived from the sums, e.g. `rocket_sum / priced` is the average
+price of a priced mission; statistics that are not derived from sums, like
+medians, come from the missions table (see `missions.costs`). `alpha3` is
+not a dimension since it follows from `country`; see
+`missions.geo.country_alpha3`.
+"""
+import numpy as np
+import pandas as pd
+
+from missions.profiling import timed
+from missions.wrangling import categorize
+
+
+DIMENSIONS = [
+    'year',
+    'month',
+    'country',
+    'Company Name',
+    'Status Rocket',
+    'Status Mission'
+]
+
+AGGREGATIONS = {
+    'launches': 'sum',
+    'rocket_sum': 'sum',
+    'priced': 'sum',
+    'first_launch': 'min',
+    'last_launch': 'max'
+}
+
+MEASURES = list(AGGREGATIONS)
+
+# Dimensions holding categorical labels rather than numbers.
+LABEL_DIMENSIONS = ['country', 'Company Name', 'Status Rocket', 'Status Mission']
+
+
+@timed('build cube')
+def build_cube(df):
+    """Aggregate the cleaned missions table into the cube."""
+    return (
+        df.assign(priced=df['Rocket'].notna(), Rocket=df['Rocket'].astype(np.float64))
+        .groupby(DIMENSIONS, observed=True)
+        .agg(
+            launches=('priced', 'size'),
+            rocket_sum=('Rocket', 'sum'),
+            priced=('priced', 'sum'),
+            first_launch=('date', 'min'),
+            last_launch=('date', 'max')
+        )
+        .sort_index()
+        .reset_index()
+    )
+
+
+def _plain_labels(frame):
+    # Roll-ups are small, and Plotly chokes on unused categories, so charts
+    # get the dimension labels as plain values.
+    for column in frame.columns:
+        if isinstance(frame[column].dtype, pd.CategoricalDtype):
+            frame[column] = frame[column].astype(frame[column].cat.categories.dtype)
+    return frame
+
+
+@timed('merge cubes')
+def merge_cubes(cubes):
+    """Combine cubes built from disjoint sets of missions into a single cube.
+
+    The result is the cube `build_cube` would produce for all of those
+    missions at once, with freshly sorted categories.
+    """
+    combined = pd.concat([_plain_labels(cube.copy()) for cube in cubes], ignore_index=True)
+    merged = combined.groupby(DIMENSIONS, sort=True).agg(AGGREGATIONS).reset_index()
+    return categorize(merged, LABEL_DIMENSIONS)
+
+
+@timed('rollup')
+def rollup(cube, by):
+    """Aggregate the measures of `cube` (or a slice of it) over the `by` dimensions.
+
+    Grouping runs on the categorical codes of the cube; only the observed
+    combinations are returned, sorted by `by`. (pandas does not honour
+    `sort=True` together with `observed=True`, hence the explicit sort.)
+    """
+    return _plain_labels(cube.groupby(by, observed=True).agg(AGGREGATIONS).sort_index().reset_index())
+
+
+@timed('distinct')
+def distinct(cube, by, column):
+    """Number of distinct `column` values within each `by` group of `cube`."""
+    return _plain_labels(cube.groupby(by, observed=True)[column].nunique().sort_index().reset_index())
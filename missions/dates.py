@@ -0,0 +1,58 @@
+"""Vectorized parsing of the `Datum` column and the calendar features built from it.
+
+Launch dates come in exactly two layouts, ``"Fri Aug 07, 2020 05:12 UTC"``
+and, when the launch time is unknown, ``"Thu Aug 29, 2019"``. Parsing them
+with explicit formats avoids pandas' per-value format inference, and the
+calendar features are read through the `.dt` accessors instead of
+Python-level `apply` calls.
+"""
+import numpy as np
+import pandas as pd
+
+
+DATETIME_FORMAT = '%a %b %d, %Y %H:%M UTC'
+DATE_FORMAT = '%a %b %d, %Y'
+
+FEATURE_DTYPES = {
+    'year': np.int16,
+    'month': np.int8,
+    'weekday': np.int8,
+    'hour': np.int8,
+}
+
+
+def _parse_unique(values):
+    datum = pd.Series(values, dtype=object)
+    has_time = datum.str.endswith(' UTC').to_numpy(dtype=bool, na_value=False)
+    parsed = np.full(len(datum), np.datetime64('NaT'), dtype='datetime64[ns]')
+    parsed[has_time] = pd.to_datetime(datum[has_time], format=DATETIME_FORMAT, errors='coerce')
+    parsed[~has_time] = pd.to_datetime(datum[~has_time], format=DATE_FORMAT, errors='coerce')
+    return parsed
+
+
+def parse_datum(datum):
+    """Parse a `Datum` series into naive UTC datetime64 values.
+
+    Each distinct string is parsed once and the result is broadcast back
+    through the factorized codes, so repeated launch dates cost nothing extra.
+    Dates without a launch time are parsed with the shorter format and fall
+    on midnight. Values matching neither layout become NaT.
+    """
+    codes, uniques = pd.factorize(datum)
+    parsed = np.append(_parse_unique(uniques), np.datetime64('NaT'))
+    return pd.Series(parsed[codes], index=datum.index, name=datum.name)
+
+
+def add_date_features(df, column='date'):
+    """Fill `year`, `month`, `weekday` and `hour` from `df[column]`, in place.
+
+    The features use the compact integer dtypes in `FEATURE_DTYPES`, so
+    `df[column]` must not hold NaT (`clean_missions` drops such rows first).
+    `weekday` follows `datetime.weekday()`, Monday being 0.
+    """
+    dt = df[column].dt
+    df['year'] = dt.year.astype(FEATURE_DTYPES['year'])
+    df['month'] = dt.month.astype(FEATURE_DTYPES['month'])
+    df['weekday'] = dt.weekday.astype(FEATURE_DTYPES['weekday'])
+    df['hour'] = dt.hour.astype(FEATURE_DTYPES['hour'])
+    return df
@@ -0,0 +1,94 @@
+"""Declarative eras and blocs, and their launch metrics.
+
+An era is a year range and a mapping of blocs to the launch countries they
+cover, e.g. the Cold War with launches from Kazakhstan (Baikonur) and the
+Russian Federation both counted as the USSR. `bloc_metrics` computes every
+yearly metric of an era's blocs in one grouped pass:
+
+- `launches`, `successes`, `failures`: numbers of missions
+- `companies`: number of distinct launch companies
+
+The countries are mapped to blocs once per category and broadcast through
+the category codes, and only the arrays the metrics need are gathered, so
+the cube itself is never copied or modified. Results are cached per era,
+dataset version and active filters, so adding an era to `ERAS` costs nothing
+until a page asks for it.
+"""
+import numpy as np
+import pandas as pd
+
+from missions import filters
+from missions.profiling import timed
+
+
+# `years` is an inclusive (first, last) range, None leaving that end open.
+ERAS = {
+    'Cold War': {
+        'years': (None, 1991),
+        'blocs': {
+            'USSR': ['Russian Federation', 'Kazakhstan'],
+            'USA': ['USA'],
+        },
+    },
+    'Commercial space age': {
+        'years': (2000, None),
+        'blocs': {
+            'USA': ['USA'],
+            'Russia': ['Russian Federation', 'Kazakhstan'],
+            'Europe': ['France'],
+            'China': ['China'],
+            'Japan': ['Japan'],
+            'India': ['India'],
+        },
+    },
+}
+
+BLOC_METRICS = ['launches', 'successes', 'failures', 'companies']
+
+
+def _bloc_codes(countries, blocs):
+    # Bloc names and, for every row, the index of its bloc (-1 for none).
+    names = list(blocs)
+    bloc_of = {country: i for i, members in enumerate(blocs.values()) for country in members}
+    per_category = np.array([bloc_of.get(country, -1) for country in countries.cat.categories] + [-1])
+    return names, per_category[countries.cat.codes.to_numpy()]
+
+
+@timed('bloc metrics')
+def bloc_metrics(cube, era):
+    """Yearly `BLOC_METRICS` of the blocs of `era` (a definition as in `ERAS`).
+
+    Returns one row per (year, bloc) with at least one launch, ordered by
+    year and bloc name, with the columns `year`, `bloc` and `BLOC_METRICS`.
+    """
+    names, bloc = _bloc_codes(cube['country'], era['blocs'])
+    years = cube['year'].to_numpy()
+    first, last = era['years']
+    rows = bloc >= 0
+    if first is not None:
+        rows &= years >= first
+    if last is not None:
+        rows &= years <= last
+
+    launches = cube['launches'].to_numpy()[rows]
+    status = cube['Status Mission'].to_numpy()[rows]
+    frame = pd.DataFrame({
+        'year': years[rows],
+        'bloc': np.array(names, dtype=object)[bloc[rows]],
+        'launches': launches,
+        'successes': np.where(status == 'Success', launches, 0),
+        'failures': np.where(status == 'Failure', launches, 0),
+        'company': cube['Company Name'].cat.codes.to_numpy()[rows],
+    })
+    return frame.groupby(['year', 'bloc'], sort=True).agg(
+        launches=('launches', 'sum'),
+        successes=('successes', 'sum'),
+        failures=('failures', 'sum'),
+        companies=('company', 'nunique'),
+    ).reset_index()
+
+
+@filters.memoize_filtered(maxsize=16)
+def era_metrics(name):
+    """`bloc_metrics` of `ERAS[name]` on the filtered cube, cached per data version and filters."""
+    return bloc_metrics(filters.filtered_cube(), ERAS[name])
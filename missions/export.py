@@ -0,0 +1,284 @@
+"""Static export of the dashboard pages, servable without any Python.
+
+Every page in `missions.pages.PAGES` is rendered once, headlessly, and its
+content written as a bundle of static files::
+
+    python -m missions.export [csv] [--output export/]
+
+    export/index.html             the first page
+    export/<page>.html            one per page
+    export/pages.json             every page as a list of content blocks
+    export/figures/<digest>.json  each distinct figure, once
+    export/assets/plotly.min.js   shared by every page
+    export/assets/<digest>.png    images
+
+Figures are compacted as in the app (see `missions.payload`) and stored by
+the digest of their JSON, so a figure shown on several pages is stored and
+downloaded once; the pages fetch them, so serve the bundle over HTTP (e.g.
+``python -m http.server -d export``). Widgets are exported in their default
+state. The bundle is written next to the output directory and moved in
+place at the end, so a server never sees half an export.
+"""
+import argparse
+import hashlib
+import html
+import io
+import json
+import logging
+import os
+import re
+import shutil
+import textwrap
+import time
+
+import pandas as pd
+import plotly
+from markdown_it import MarkdownIt
+
+from missions.pages import PAGES
+from missions.wrangling import DATASET_PATH
+
+
+logger = logging.getLogger(__name__)
+
+EXPORT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'export')
+
+# Rows of a table shown in the export; the rest is elided.
+MAX_TABLE_ROWS = 50
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>%(title)s - Space Missions Analysis</title>
+<script src="assets/plotly.min.js"></script>
+<style>
+body { margin: 0; font-family: sans-serif; display: flex; }
+nav { width: 16rem; padding: 1rem; background: #f0f2f6; min-height: 100vh; }
+nav a { display: block; padding: .3rem 0; color: inherit; }
+nav a.active { font-weight: bold; }
+main { flex: 1; padding: 1rem 3rem; max-width: 60rem; }
+.chart { margin: 1rem 0; }
+table { border-collapse: collapse; font-size: .8rem; }
+td, th { padding: .2rem .5rem; border-bottom: 1px solid #ddd; }
+</style>
+</head>
+<body>
+<nav><h3>&#128640; Space Missions Analysis</h3>%(nav)s</nav>
+<main>
+%(body)s
+</main>
+<script>
+document.querySelectorAll('[data-figure]').forEach(function (div) {
+  fetch(div.dataset.figure).then(function (response) { return response.json(); }).then(function (fig) {
+    // The whole figure, so animation frames come along with data and layout.
+    fig.config = {responsive: true};
+    Plotly.newPlot(div, fig);
+  });
+});
+</script>
+</body>
+</html>
+"""
+
+_markdown = MarkdownIt('commonmark').enable('table')
+
+
+def page_file(name):
+    return re.sub(r'\W+', '_', name.lower()).strip('_') + '.html'
+
+
+class StaticPage:
+    """Stands in for the `streamlit` module while a page renders, recording its content as blocks.
+
+    Figures go through `missions.charts.capture`; they are moved into the
+    blocks whenever other content is recorded, so the blocks keep the order
+    of the page.
+    """
+
+    def __init__(self, figures, bundle):
+        self.blocks = []
+        self._figures = figures
+        self._bundle = bundle
+        self._seen = 0
+
+    def _add(self, block):
+        self.flush()
+        self.blocks.append(block)
+
+    def flush(self):
+        for chart, params, fig in self._figures[self._seen:]:
+            self.blocks.append({'figure': self._bundle.add_figure(fig), 'chart': chart})
+        self._seen = len(self._figures)
+
+    def markdown(self, body, **kwargs):
+        self._add({'markdown': textwrap.dedent(body).strip()})
+
+    def title(self, body, **kwargs):
+        self.markdown('# ' + body)
+
+    def header(self, body, **kwargs):
+        self.markdown('## ' + body)
+
+    def caption(self, body, **kwargs):
+        self.markdown('<small>%s</small>' % body)
+
+    def write(self, *args, **kwargs):
+        for value in args:
+            if isinstance(value, str):
+                self.markdown(value)
+            elif isinstance(value, pd.DataFrame):
+                self.dataframe(value)
+            else:
+                self._add({'json': json.loads(json.dumps(value, default=str))})
+
+    def dataframe(self, data, **kwargs):
+        self._add({'table': data.to_html(max_rows=MAX_TABLE_ROWS, border=0)})
+
+    def image(self, image, width=None, **kwargs):
+        self._add({'image': self._bundle.add_image(image), 'width': width})
+
+    # Widgets keep their defaults.
+
+    def radio(self, label, options, index=0, **kwargs):
+        return list(options)[index]
+
+    def selectbox(self, label, options, index=0, **kwargs):
+        return list(options)[index]
+
+    def multiselect(self, label, options, default=None, **kwargs):
+        return list(default or [])
+
+    def checkbox(self, label, value=False, **kwargs):
+        return value
+
+    def __getattr__(self, name):
+        logger.warning('st.%s is not exported', name)
+        return lambda *args, **kwargs: None
+
+
+class Bundle:
+    """The files of an export: shared figures and assets, and the pages referring to them."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.pages = []
+        self.figures = 0
+        os.makedirs(os.path.join(directory, 'figures'))
+        os.makedirs(os.path.join(directory, 'assets'))
+
+    def _write(self, name, data):
+        # Content-addressed, so an existing file already holds the same data.
+        path = os.path.join(self.directory, name)
+        if os.path.exists(path):
+            return False
+        with open(path, 'wb') as f:
+            f.write(data)
+        return True
+
+    def add_figure(self, fig):
+        from missions.payload import compact_figure
+
+        data = compact_figure(fig).to_json().encode()
+        name = 'figures/%s.json' % hashlib.sha1(data).hexdigest()[:16]
+        self.figures += self._write(name, data)
+        return name
+
+    def add_image(self, image):
+        if isinstance(image, (str, os.PathLike)):
+            with open(image, 'rb') as f:
+                data = f.read()
+            extension = os.path.splitext(image)[1]
+        else:
+            buffer = io.BytesIO()
+            image.save(buffer, format='PNG')
+            data, extension = buffer.getvalue(), '.png'
+        name = 'assets/%s%s' % (hashlib.sha1(data).hexdigest()[:16], extension)
+        self._write(name, data)
+        return name
+
+    def render_page(self, name):
+        """Render page `name` headlessly and add its blocks to the bundle."""
+        # Imported here so the module can be imported without Streamlit.
+        from missions import charts
+        from missions.pages import load_page
+
+        module = load_page(name)
+        with charts.capture() as figures:
+            page = StaticPage(figures, self)
+            module.st, streamlit = page, module.st
+            try:
+                module.render()
+            finally:
+                module.st = streamlit
+            page.flush()
+        self.pages.append({'name': name, 'file': page_file(name), 'blocks': page.blocks})
+
+    def _html(self, page):
+        nav = ''.join(
+            '<a href="%s"%s>%s</a>' % (other['file'], ' class="active"' if other is page else '', html.escape(other['name']))
+            for other in self.pages
+        )
+        body = []
+        for block in page['blocks']:
+            if 'markdown' in block:
+                body.append(_markdown.render(block['markdown']))
+            elif 'figure' in block:
+                body.append('<div class="chart" data-figure="%s"></div>' % block['figure'])
+            elif 'image' in block:
+                width = ' width="%d"' % block['width'] if block['width'] else ''
+                body.append('<img src="%s"%s alt="">' % (block['image'], width))
+            elif 'table' in block:
+                body.append(block['table'])
+            else:
+                body.append('<pre>%s</pre>' % html.escape(json.dumps(block['json'], indent=2)))
+        return PAGE_TEMPLATE % {'title': html.escape(page['name']), 'nav': nav, 'body': '\n'.join(body)}
+
+    def finish(self, manifest):
+        """Write the page files, the shared plotly.js and `pages.json`."""
+        for page in self.pages:
+            self._write(page['file'], self._html(page).encode())
+        self._write('index.html', self._html(self.pages[0]).encode())
+        self._write('assets/plotly.min.js', plotly.offline.get_plotlyjs().encode())
+        with open(os.path.join(self.directory, 'pages.json'), 'w') as f:
+            json.dump(dict(manifest, pages=self.pages), f, indent=1)
+
+
+def export(path=DATASET_PATH, output=EXPORT_DIR):
+    """Export every page of the dashboard on the dataset at `path` into `output`."""
+    from missions.loader import dataset_version, use_dataset
+
+    use_dataset(path)
+    scratch = '%s.%d.tmp' % (output.rstrip(os.sep), os.getpid())
+    shutil.rmtree(scratch, ignore_errors=True)
+    bundle = Bundle(scratch)
+    for name in PAGES:
+        start = time.perf_counter()
+        bundle.render_page(name)
+        logger.info('%s: %d blocks in %.2fs', name, len(bundle.pages[-1]['blocks']), time.perf_counter() - start)
+    bundle.finish({
+        'dataset': os.path.abspath(path),
+        'version': dataset_version(path),
+        'plotly': plotly.__version__,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+    })
+    shutil.rmtree(output, ignore_errors=True)
+    os.replace(scratch, output)
+    logger.info('Wrote %d pages and %d distinct figures to %s', len(bundle.pages), bundle.figures, output)
+    return output
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('csv', nargs='?', default=DATASET_PATH, help='dataset CSV to export')
+    parser.add_argument('--output', default=EXPORT_DIR, help='export directory')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    start = time.perf_counter()
+    export(args.csv, args.output)
+    logger.info('Done in %.2fs', time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    main()
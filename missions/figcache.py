@@ -0,0 +1,70 @@
+"""Process-wide LRU cache of built Plotly figures.
+
+Figures are keyed on (page, chart id, data version, filter parameters), so
+moving back and forth between pages reuses the figures built earlier instead
+of rebuilding them. The cache is bounded by the serialized size of the
+figures it holds and evicts the least recently used ones first.
+"""
+import os
+import threading
+
+from cachetools import LRUCache
+
+
+# Memory budget for cached figures, in bytes of figure JSON.
+FIGURE_CACHE_BYTES = int(os.environ.get('MISSIONS_FIGURE_CACHE_BYTES', 64 * 1024 * 1024))
+
+
+def figure_size(fig):
+    """Size in bytes of the JSON the figure is sent to the browser as."""
+    return len(fig.to_json())
+
+
+class FigureCache:
+    """Thread-safe, size-bounded LRU cache of Plotly figures with hit/miss counters."""
+
+    def __init__(self, maxsize=FIGURE_CACHE_BYTES):
+        self._figures = LRUCache(maxsize=maxsize, getsizeof=lambda entry: entry[1])
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, key, build):
+        """Return the figure cached under `key`, calling `build()` on a miss."""
+        with self._lock:
+            entry = self._figures.get(key)
+            if entry is not None:
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        fig = build()
+        size = figure_size(fig)
+        with self._lock:
+            if size <= self._figures.maxsize:
+                self._figures[key] = (fig, size)
+        return fig
+
+    def clear(self):
+        with self._lock:
+            self._figures.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'figures': len(self._figures),
+                'bytes': self._figures.currsize,
+                'max_bytes': self._figures.maxsize,
+            }
+
+
+def figure_key(page, chart, version, **params):
+    """Cache key for one chart of one page under the given data version and filters."""
+    return (page, chart, version, tuple(sorted(params.items())))
+
+
+figure_cache = FigureCache()
@@ -0,0 +1,262 @@
+"""Global sidebar filters: year range, country, company and mission status.
+
+The filters apply to the aggregate cube every page is drawn from, and to the
+missions table for the few statistics the cube cannot answer. They are
+evaluated through a `RowIndex` built once per dataset version rather than
+through boolean masks over the whole cube:
+
+- the year range is two `searchsorted` calls on the sorted year column,
+  giving a contiguous run of row positions;
+- each label filter is the union of the precomputed row-position arrays of
+  the selected labels;
+
+and the selections are intersected as sorted position arrays, so the cost
+grows with the number of selected rows, not with the size of the cube.
+
+The active filters are also part of every figure's cache key (see
+`missions.charts.plot`), so each combination gets its own cached figures,
+and of the key of every aggregate memoized with `memoize_filtered`.
+"""
+import functools
+import threading
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from cachetools import LRUCache
+
+from missions.loader import dataset_version, load_cube, load_missions
+from missions.profiling import timed
+
+
+# Filterable label columns of the cube and their sidebar labels.
+FILTER_COLUMNS = {
+    'country': 'Country',
+    'Company Name': 'Company',
+    'Status Mission': 'Mission status',
+}
+
+_indexes = LRUCache(maxsize=4)
+_indexes_lock = threading.Lock()
+
+# Caches of the `memoize_filtered` functions, for `clear_memos`.
+_memos = []
+
+
+class RowIndex:
+    """Row positions of a frame by year and by label, for filtering without masks."""
+
+    def __init__(self, frame, columns=FILTER_COLUMNS):
+        self.size = len(frame)
+        years = frame['year'].to_numpy()
+        if (np.diff(years) >= 0).all():
+            # The cube is sorted by year already.
+            self._year_order = None
+            self._years = years
+        else:
+            self._year_order = np.argsort(years, kind='stable')
+            self._years = years[self._year_order]
+        self._labels = {}
+        for column in columns:
+            values = frame[column]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                codes, labels = values.cat.codes.to_numpy(), values.cat.categories
+            else:
+                codes, labels = pd.factorize(values)
+            # Positions of the rows of label c are order[bounds[c]:bounds[c + 1]],
+            # in ascending order since the sort is stable.
+            order = np.argsort(codes, kind='stable')
+            bounds = np.searchsorted(codes[order], np.arange(len(labels) + 1))
+            self._labels[column] = (pd.Index(labels), codes, order, bounds)
+
+    def _year_bounds(self, low, high):
+        return np.searchsorted(self._years, low, side='left'), np.searchsorted(self._years, high, side='right')
+
+    def years(self, low, high):
+        """Sorted positions of the rows with `low <= year <= high`."""
+        start, stop = self._year_bounds(low, high)
+        if self._year_order is None:
+            return np.arange(start, stop)
+        return np.sort(self._year_order[start:stop])
+
+    def _codes(self, column, values):
+        labels = self._labels[column][0]
+        codes = labels.get_indexer(list(values))
+        return codes[codes >= 0]
+
+    def _runs(self, column, values, start=0, stop=None):
+        # Row positions of each selected label, clipped to [start, stop).
+        _, _, order, bounds = self._labels[column]
+        runs = []
+        for code in self._codes(column, values):
+            run = order[bounds[code]:bounds[code + 1]]
+            if start or stop is not None:
+                run = run[np.searchsorted(run, start):np.searchsorted(run, self.size if stop is None else stop)]
+            runs.append(run)
+        return runs
+
+    def _member(self, column, values):
+        # Lookup table from code to "is selected"; code -1 (missing) maps to
+        # the trailing False.
+        member = np.zeros(len(self._labels[column][0]) + 1, dtype=bool)
+        member[self._codes(column, values)] = True
+        return member
+
+    def labels(self, column, values):
+        """Sorted positions of the rows whose `column` is one of `values`."""
+        runs = self._runs(column, values)
+        if not runs:
+            return np.empty(0, dtype=np.intp)
+        return runs[0] if len(runs) == 1 else np.sort(np.concatenate(runs))
+
+    def select(self, filters):
+        """Sorted positions of the rows matching every filter (see `active`), or None for all rows.
+
+        The year range narrows the search to a contiguous run of rows. The
+        most selective label filter then supplies the candidate positions,
+        from its position arrays when they are small compared to that run,
+        else by a code lookup over the run; the other label filters are
+        checked per candidate through their code lookups.
+        """
+        if not filters:
+            return None
+        labels = {name: value for name, value in filters.items() if name != 'years'}
+        start, stop = 0, self.size
+        positions = None
+        if 'years' in filters:
+            if self._year_order is None:
+                start, stop = self._year_bounds(*filters['years'])
+            else:
+                positions = self.years(*filters['years'])
+        if not labels:
+            return np.arange(start, stop) if positions is None else positions
+
+        sizes = {name: sum(len(run) for run in self._runs(name, value, start, stop)) for name, value in labels.items()}
+        driver = min(labels, key=sizes.get)
+        if positions is not None:
+            positions = positions[self._member(driver, labels[driver])[self._labels[driver][1][positions]]]
+        elif sizes[driver] * 8 < stop - start:
+            runs = self._runs(driver, labels[driver], start, stop)
+            positions = np.sort(np.concatenate(runs)) if runs else np.empty(0, dtype=np.intp)
+        else:
+            scan = np.arange(start, stop)
+            positions = scan[self._member(driver, labels[driver])[self._labels[driver][1][start:stop]]]
+        for name, value in labels.items():
+            if name != driver:
+                positions = positions[self._member(name, value)[self._labels[name][1][positions]]]
+        return positions
+
+
+def row_index(frame, key):
+    """The `RowIndex` of `frame`, built once per `key` (e.g. a table name and dataset version)."""
+    with _indexes_lock:
+        index = _indexes.get(key)
+    if index is None:
+        index = RowIndex(frame)
+        with _indexes_lock:
+            _indexes[key] = index
+    return index
+
+
+def cube_index(cube, version):
+    """The `RowIndex` of the cube of dataset `version`, built once per version."""
+    return row_index(cube, ('cube', version))
+
+
+@timed('filter cube')
+def apply_filters(cube, filters, version):
+    positions = cube_index(cube, version).select(filters)
+    return cube if positions is None else cube.iloc[positions]
+
+
+def active():
+    """The filters set in the sidebar, as {'years': (low, high), column: labels}.
+
+    Only filters that restrict something are included, so with the defaults
+    (and outside a Streamlit session) this is empty.
+    """
+    return st.session_state.get('filters', {})
+
+
+def filtered_cube():
+    """The aggregate cube restricted to the active filters."""
+    filters = active()
+    cube = load_cube()
+    if not filters:
+        return cube
+    cube = apply_filters(cube, filters, dataset_version())
+    if not len(cube):
+        st.warning('No launches match the filters.')
+        st.stop()
+    return cube
+
+
+@timed('filter missions')
+def filtered_missions():
+    """The missions table restricted to the active filters.
+
+    Only for statistics that cannot be derived from the cube, such as
+    medians; everything else should use `filtered_cube`.
+    """
+    filters = active()
+    missions = load_missions()
+    if not filters:
+        return missions
+    positions = row_index(missions, ('missions', dataset_version())).select(filters)
+    return missions.iloc[positions]
+
+
+def memoize_filtered(maxsize):
+    """Decorator caching a function of the filtered data per dataset version, active filters and arguments.
+
+    Results are kept in an LRU cache of `maxsize` entries shared by every
+    session; list arguments are keyed as tuples. A cached result is shared
+    between callers; treat it as read-only.
+    """
+    def decorate(func):
+        results = LRUCache(maxsize=maxsize)
+        lock = threading.Lock()
+        _memos.append((results, lock))
+
+        @functools.wraps(func)
+        def memoized(*args, **kwargs):
+            key = (
+                dataset_version(),
+                tuple(sorted(active().items())),
+                tuple(tuple(value) if isinstance(value, list) else value for value in args),
+                tuple(sorted((name, tuple(value) if isinstance(value, list) else value) for name, value in kwargs.items())),
+            )
+            with lock:
+                result = results.get(key)
+            if result is None:
+                result = func(*args, **kwargs)
+                with lock:
+                    results[key] = result
+            return result
+        return memoized
+    return decorate
+
+
+def clear_memos():
+    """Empty the caches of every `memoize_filtered` function, e.g. between benchmark runs."""
+    for results, lock in _memos:
+        with lock:
+            results.clear()
+
+
+def sidebar():
+    """Draw the filter widgets in the sidebar and store the active filters."""
+    cube = load_cube()
+    low, high = int(cube['year'].min()), int(cube['year'].max())
+    filters = {}
+    with st.sidebar.expander('Filters'):
+        years = st.slider('Years', low, high, (low, high), key='filter_years')
+        if tuple(years) != (low, high):
+            filters['years'] = tuple(years)
+        for column, label in FILTER_COLUMNS.items():
+            options = sorted(cube[column].dropna().unique())
+            selected = st.multiselect(label, options, key='filter_%s' % column)
+            if selected:
+                filters[column] = tuple(sorted(selected))
+    st.session_state['filters'] = filters
+    return filters
@@ -0,0 +1,302 @@
+"""Launch-cadence forecasts per country or company.
+
+`launch_series` turns the cube into one launch-count series per member
+(yearly or monthly, from the member's first launch on), and
+`forecast_series` fits an ARIMA model to each and forecasts the next
+periods:
+
+- fits run in a process pool shared by every session, so a batch of series
+  is fitted in parallel and never inside the Streamlit script thread. A
+  process that is itself a pool worker, e.g. of `missions.precompute`, fits
+  in process instead of starting a pool of its own;
+- each fit is stored as JSON in the fit directory of the dataset (see
+  `fit_dir`), keyed on a hash of the series values, its start, the model
+  order and the horizon. A series that did not change since it was last
+  fitted, e.g. because new launches only concern other members, is never
+  refitted, across reruns and restarts. Once per dataset version the fits
+  of series that no longer exist are pruned, so an append-only feed does
+  not grow the directory forever.
+
+`forecasts` memoizes the whole batch per dataset version, filters and
+grouping on top of that.
+"""
+import atexit
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pandas as pd
+from missions import filters
+from missions.cube import rollup
+from missions.loader import dataset_path, dataset_version, load_cube
+from missions.profiling import timed
+
+
+logger = logging.getLogger(__name__)
+
+# Directory holding the fit directories of every dataset; by default each
+# dataset keeps its fits next to its CSV.
+FORECAST_DIR = os.environ.get('MISSIONS_FORECASTS')
+
+# Worker processes fitting models; 0 fits in the calling process.
+FORECAST_JOBS = int(os.environ.get('MISSIONS_FORECAST_JOBS', os.cpu_count() or 1))
+
+# Cube columns the forecasts are grouped by.
+GROUPINGS = ['country', 'Company Name']
+
+# ARIMA (p, d, q) order of every model.
+ORDER = (1, 1, 1)
+
+# Periods forecast per frequency.
+HORIZONS = {'yearly': 5, 'monthly': 24}
+
+# Forecast intervals cover 1 - INTERVAL_ALPHA of the outcomes.
+INTERVAL_ALPHA = 0.2
+
+# Members with fewer launches get no forecast.
+MIN_LAUNCHES = 20
+
+_pool = None
+_pool_lock = threading.Lock()
+
+# (fit directory, dataset version) pairs already pruned.
+_pruned = set()
+_pruned_lock = threading.Lock()
+
+
+def launch_series(cube, by, freq='yearly', min_launches=MIN_LAUNCHES):
+    """Launch counts of every `by` member with at least `min_launches` launches.
+
+    Returns {member: (start, counts)}, where `counts` is an int64 array with
+    one entry per period (zeros included) from the member's first launch to
+    the last period of `cube`, and `start` is the first period: a year, or
+    ``year * 12 + month - 1`` for monthly series.
+    """
+    keys = ['year'] if freq == 'yearly' else ['year', 'month']
+    data = rollup(cube, keys + [by])
+    if not len(data):
+        return {}
+    period = data['year'] if freq == 'yearly' else data['year'] * 12 + data['month'] - 1
+    table = data['launches'].groupby([period.rename('period'), data[by]]).sum().unstack(by, fill_value=0)
+    table = table.reindex(range(table.index.min(), table.index.max() + 1), fill_value=0)
+
+    series = {}
+    for member in table.columns:
+        counts = table[member].to_numpy(dtype=np.int64)
+        if counts.sum() < min_launches:
+            continue
+        first = int(np.flatnonzero(counts)[0])
+        series[member] = (int(table.index[first]), counts[first:])
+    return series
+
+
+def series_key(start, counts, freq, order=ORDER):
+    """Hash identifying a fit: the series and everything the model depends on."""
+    sha = hashlib.sha1(np.ascontiguousarray(counts, dtype=np.int64).tobytes())
+    sha.update(repr((start, freq, order, HORIZONS[freq], INTERVAL_ALPHA)).encode())
+    return sha.hexdigest()
+
+
+def fit_series(counts, order, horizon):
+    """Fit an ARIMA model to `counts` and forecast `horizon` periods; runs in a worker process."""
+    import warnings
+
+    from statsmodels.tsa.arima.model import ARIMA
+
+    with warnings.catch_warnings():
+        # Short, sparse series often trigger convergence warnings.
+        warnings.simplefilter('ignore')
+        result = ARIMA(np.asarray(counts, dtype=np.float64), order=order).fit()
+        forecast = result.get_forecast(horizon)
+        interval = np.asarray(forecast.conf_int(alpha=INTERVAL_ALPHA))
+    # Launch counts cannot be negative.
+    return {
+        'params': dict(zip(result.model.param_names, np.asarray(result.params).tolist())),
+        'aic': float(result.aic),
+        'forecast': np.clip(np.asarray(forecast.predicted_mean), 0, None).tolist(),
+        'lower': np.clip(interval[:, 0], 0, None).tolist(),
+        'upper': np.clip(interval[:, 1], 0, None).tolist(),
+    }
+
+
+def fit_dir(csv_path):
+    """Directory of the fits of the dataset at `csv_path`.
+
+    ``<name>.forecasts`` next to the CSV, like its snapshot, or a directory
+    named after the dataset under `FORECAST_DIR` if that is set.
+    """
+    name = os.path.splitext(os.path.basename(csv_path))[0]
+    if FORECAST_DIR is None:
+        return os.path.join(os.path.dirname(os.path.abspath(csv_path)), name + '.forecasts')
+    return os.path.join(FORECAST_DIR, '%s-%s' % (name, hashlib.sha1(os.path.abspath(csv_path).encode()).hexdigest()[:12]))
+
+
+def _path(key, directory):
+    return os.path.join(directory, key[:2], key + '.json')
+
+
+def read_fit(key, directory):
+    try:
+        with open(_path(key, directory)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_fit(key, fit, directory):
+    path = _path(key, directory)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + '.tmp', 'w') as f:
+            json.dump(fit, f)
+        os.replace(path + '.tmp', path)
+    except OSError:
+        logger.warning('Could not store the fit %s', key, exc_info=True)
+
+
+def series_keys(cube):
+    """Keys of the fits of every unfiltered series of `cube`, for each grouping and frequency."""
+    return {
+        series_key(start, counts, freq)
+        for by in GROUPINGS for freq in HORIZONS
+        for start, counts in launch_series(cube, by, freq).values()
+    }
+
+
+def prune_fits(directory, keep):
+    """Delete the fits under `directory` whose key is not in `keep`; returns the number deleted."""
+    deleted = 0
+    for root, dirs, files in os.walk(directory):
+        for name in files:
+            key, extension = os.path.splitext(name)
+            if extension != '.json' or key in keep:
+                continue
+            try:
+                os.remove(os.path.join(root, name))
+                deleted += 1
+            except FileNotFoundError:
+                pass
+    return deleted
+
+
+def _prune_once(directory, version):
+    # Fits of filtered series are pruned too; they are refitted on demand.
+    with _pruned_lock:
+        if (directory, version) in _pruned:
+            return
+        _pruned.add((directory, version))
+    deleted = prune_fits(directory, series_keys(load_cube()))
+    if deleted:
+        logger.info('Pruned %d stale fits from %s', deleted, directory)
+
+
+def _executor():
+    # One pool for the whole process. Workers are spawned rather than forked,
+    # since the Streamlit server runs threads.
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=FORECAST_JOBS, mp_context=multiprocessing.get_context('spawn'))
+        return _pool
+
+
+def _discard_executor(wait=False):
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=wait, cancel_futures=True)
+        _pool = None
+
+
+# Idle workers would otherwise keep the interpreter from exiting.
+atexit.register(_discard_executor, wait=True)
+
+
+@timed('forecast series')
+def forecast_series(series, freq, directory, parallel=None):
+    """Fits and forecasts of every series of `launch_series`, refitting only series not fitted in `directory` before.
+
+    New fits run in the shared process pool if `parallel` is true. By
+    default they do when `FORECAST_JOBS` is positive and this process is
+    not itself a worker of some pool, which would oversubscribe the CPUs.
+    Returns ({member: fit}, number of series fitted now); a fit is the dict
+    of `fit_series`, or None if the model could not be fitted.
+    """
+    fits, missing = {}, {}
+    for member, (start, counts) in series.items():
+        key = series_key(start, counts, freq)
+        fits[member] = read_fit(key, directory)
+        if fits[member] is None:
+            missing[member] = key
+    if not missing:
+        return fits, 0
+
+    horizon = HORIZONS[freq]
+    if parallel is None:
+        parallel = FORECAST_JOBS > 0 and multiprocessing.parent_process() is None
+    pending = {}
+    if parallel:
+        pool = _executor()
+        pending = {member: pool.submit(fit_series, series[member][1], ORDER, horizon) for member in missing}
+    for member, key in missing.items():
+        try:
+            try:
+                fits[member] = pending[member].result() if member in pending else fit_series(series[member][1], ORDER, horizon)
+            except BrokenProcessPool:
+                logger.warning('The forecast worker pool broke, fitting in process instead', exc_info=True)
+                _discard_executor()
+                pending = {}
+                fits[member] = fit_series(series[member][1], ORDER, horizon)
+        except Exception:
+            logger.warning('Could not fit a model to the launches of %s', member, exc_info=True)
+            continue
+        write_fit(key, fits[member], directory)
+    return fits, len(missing)
+
+
+def forecast_frame(series, fits, freq):
+    """History and forecasts of every fitted member as one long frame.
+
+    Columns: `period` (a year, or the first day of a month), `member`,
+    `launches` (NaN for the forecast), and `forecast`, `lower` and `upper`
+    (NaN for the history, except for the last observed period, so that
+    the forecast line joins the history).
+    """
+    frames = []
+    for member, fit in fits.items():
+        if fit is None:
+            continue
+        start, counts = series[member]
+        history = np.arange(start, start + len(counts))
+        future = np.arange(history[-1] + 1, history[-1] + 1 + len(fit['forecast']))
+        last = float(counts[-1])
+        frames.append(pd.DataFrame({
+            'period': np.concatenate([history, future]),
+            'member': member,
+            'launches': np.concatenate([counts, np.full(len(future), np.nan)]),
+            'forecast': np.concatenate([np.full(len(history) - 1, np.nan), [last], fit['forecast']]),
+            'lower': np.concatenate([np.full(len(history) - 1, np.nan), [last], fit['lower']]),
+            'upper': np.concatenate([np.full(len(history) - 1, np.nan), [last], fit['upper']]),
+        }))
+    if not frames:
+        return pd.DataFrame(columns=['period', 'member', 'launches', 'forecast', 'lower', 'upper'])
+    frame = pd.concat(frames, ignore_index=True)
+    if freq == 'monthly':
+        frame['period'] = pd.to_datetime(dict(year=frame['period'] // 12, month=frame['period'] % 12 + 1, day=1))
+    return frame
+
+
+@filters.memoize_filtered(maxsize=16)
+def forecasts(by, freq='yearly'):
+    """(`launch_series`, fits, number fitted now) of the filtered cube, cached per data version, filters and grouping."""
+    directory = fit_dir(dataset_path())
+    _prune_once(directory, dataset_version())
+    series = launch_series(filters.filtered_cube(), by, freq)
+    fits, fitted = forecast_series(series, freq, directory)
+    return series, fits, fitted
@@ -0,0 +1,103 @@
+"""Resolution of launch locations to countries and ISO 3166 alpha-3 codes.
+
+The country of a launch is the last comma-separated part of its `Location`,
+after mapping launch sites that are not countries (seas, ranges, states) to
+the country operating them. The alpha-3 code then comes from a lookup table
+built once from `iso3166`, extended with the short names used in the dataset
+and with historical states.
+
+Resolution runs once per distinct location and the results are broadcast
+back to the rows through the categorical codes of `Location`.
+"""
+import functools
+
+import numpy as np
+import pandas as pd
+from iso3166 import countries
+
+
+# Location suffixes that are launch sites rather than countries.
+SITE_COUNTRIES = {
+    'Russia': 'Russian Federation',
+    'New Mexico': 'USA',
+    'Yellow Sea': 'China',
+    'Shahrud Missile Test Site': 'Iran',
+    'Pacific Missile Range Facility': 'USA',
+    'Barents Sea': 'Russian Federation',
+    'Gran Canaria': 'USA',
+}
+
+# Country names used in the dataset (or elsewhere in the app) that differ
+# from the iso3166 names. Historical states map to their successor.
+COUNTRY_ALIASES = {
+    'USA': 'USA',
+    'Iran': 'IRN',
+    'North Korea': 'PRK',
+    'South Korea': 'KOR',
+    'Russia': 'RUS',
+    'USSR': 'RUS',
+}
+
+# Launches from international waters: valid countries for the charts, but
+# with no territory to draw on a map.
+INTERNATIONAL_WATERS = {'Pacific Ocean'}
+
+
+@functools.lru_cache(maxsize=None)
+def alpha3_lookup():
+    """Country name (or alpha-3 code) to alpha-3 code."""
+    lookup = {}
+    for c in countries:
+        lookup[c.name] = c.alpha3
+        lookup[c.apolitical_name] = c.alpha3
+        lookup[c.alpha3] = c.alpha3
+    lookup.update(COUNTRY_ALIASES)
+    return lookup
+
+
+def location_country(location):
+    """Country label of a single `Location` value."""
+    suffix = location.split(', ')[-1]
+    return SITE_COUNTRIES.get(suffix, suffix)
+
+
+def resolve_locations(location):
+    """Return `(country, alpha3)` categorical series for a `Location` series.
+
+    Unresolvable alpha-3 codes are NaN. Both results have sorted categories.
+    """
+    location = location.astype('category')
+    country_of = np.array([location_country(l) for l in location.cat.categories], dtype=object)
+    lookup = alpha3_lookup()
+    alpha3_of = np.array([lookup.get(c) for c in country_of], dtype=object)
+
+    codes = location.cat.codes.to_numpy()
+    return (
+        _broadcast(country_of, codes, location.index, 'country'),
+        _broadcast(alpha3_of, codes, location.index, 'alpha3'),
+    )
+
+
+def _broadcast(values_of, codes, index, name):
+    # Re-encode per-location values as their own sorted categories, then
+    # look every row up through the location codes.
+    present = pd.notna(values_of)
+    categories = np.array(sorted(set(values_of[present])), dtype=object)
+    value_codes = np.full(len(values_of) + 1, -1, dtype=np.int32)
+    value_codes[:-1][present] = np.searchsorted(categories, values_of[present].astype(str))
+    return pd.Series(
+        pd.Categorical.from_codes(value_codes[codes], categories=categories),
+        index=index,
+        name=name
+    )
+
+
+def country_alpha3(country):
+    """Alpha-3 codes for a series of country labels, NaN where there is none."""
+    return country.map(alpha3_lookup())
+
+
+def unresolved_locations(df):
+    """Locations whose country has no alpha-3 code and is not international waters."""
+    missing = df['alpha3'].isna() & ~df['country'].isin(INTERNATIONAL_WATERS)
+    return df.loc[missing, ['Location', 'country']].drop_duplicates().sort_values('Location').reset_index(drop=True)
@@ -0,0 +1,130 @@
+"""Incremental refresh of the cleaned table and the aggregate cube.
+
+The launch log only ever grows at the end, so when the CSV changes it is
+usually enough to parse the bytes appended since the last read. The table
+records how much of the file it covers in `df.attrs['csv_state']` (see
+`missions.wrangling.csv_state`); a refresh reads from that offset on, cleans
+the new rows and merges them into the table and into the cube, which every
+page aggregate is rolled up from. Refresh cost is proportional to the new
+data, not to the length of the log (bar the copy `pd.concat` makes). The
+snapshot is only rewritten on a full reload; an older snapshot is simply
+caught up as a delta on the next start.
+
+If the file was rewritten instead (it shrank, or its leading bytes changed)
+everything is rebuilt from scratch.
+"""
+import io
+import logging
+import os
+import threading
+import time
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from missions.cube import build_cube, merge_cubes
+from missions.profiling import timed
+from missions.snapshot import is_compatible, load_snapshot, read_snapshot, write_snapshot
+from missions.wrangling import (
+    DATASET_PATH, clean_missions, csv_state, read_complete_lines, read_head, read_missions, read_raw
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+def is_extension(path, state):
+    """True when the file at `path` is the file described by `state` plus appended bytes."""
+    if not state:
+        return False
+    try:
+        if os.path.getsize(path) < state['bytes']:
+            return False
+        head = read_head(path, state['bytes'])
+    except OSError:
+        return False
+    return csv_state(head, state['bytes']) == state
+
+
+def read_header(path):
+    with open(path, 'rb') as f:
+        return f.readline()
+
+
+def append_missions(df, delta):
+    """Concatenate two cleaned tables, keeping categoricals with sorted categories.
+
+    The result equals what `clean_missions` produces for all rows at once.
+    """
+    combined = pd.concat([df, delta], ignore_index=True)
+    for column in df.columns:
+        if isinstance(df[column].dtype, pd.CategoricalDtype):
+            combined[column] = union_categoricals([df[column], delta[column]], sort_categories=True)
+    return combined
+
+
+class IncrementalTable:
+    """The cleaned missions table and its cube, kept up to date with an append-only CSV.
+
+    `refresh()` is safe to call from several threads; readers should take
+    `df` and `cube` after it returns, together through `state()`, and treat
+    both as read-only.
+    """
+
+    def __init__(self, path=DATASET_PATH):
+        self.path = path
+        self.df = None
+        self.cube = None
+        self._lock = threading.Lock()
+
+    def state(self):
+        """The table and the cube as of the last refresh, read together."""
+        with self._lock:
+            return self.df, self.cube
+
+    def _initial(self):
+        # A snapshot of an older, shorter log is still a good starting point:
+        # the rows it lacks are read as a delta by `refresh`.
+        if is_compatible(self.path):
+            df = read_snapshot(self.path)
+            if df.attrs.get('csv_state'):
+                return df
+        return load_snapshot(self.path)
+
+    def _save(self):
+        try:
+            write_snapshot(self.df, self.path)
+        except OSError:
+            logger.warning('Could not write snapshot for %s', self.path, exc_info=True)
+
+    @timed('refresh table')
+    def refresh(self):
+        """Bring the table and the cube up to date with the CSV.
+
+        Returns the number of rows added, or None if everything was reloaded.
+        """
+        with self._lock:
+            if self.df is None:
+                self.df = self._initial()
+                self.cube = build_cube(self.df)
+
+            state = self.df.attrs.get('csv_state')
+            if not is_extension(self.path, state):
+                logger.info('%s was rewritten, reloading it', self.path)
+                self.df = read_missions(self.path)
+                self.cube = build_cube(self.df)
+                self._save()
+                return None
+
+            start = time.perf_counter()
+            data, end = read_complete_lines(self.path, state['bytes'])
+            if not data:
+                return 0
+            delta = clean_missions(read_raw(io.BytesIO(read_header(self.path) + data)))
+            df = append_missions(self.df, delta)
+            df.attrs['timings'] = {'delta': time.perf_counter() - start, 'delta rows': len(delta)}
+            df.attrs['csv_state'] = csv_state(read_head(self.path, end), end)
+            self.cube = merge_cubes([self.cube, build_cube(delta)])
+            self.df = df
+            logger.info('Appended %d missions from %s in %.3fs', len(delta), self.path, df.attrs['timings']['delta'])
+            return len(delta)
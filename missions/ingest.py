@@ -0,0 +1,75 @@
+"""Chunked ingestion of launch logs that do not fit in memory.
+
+The CSV is read `chunksize` rows at a time. Every chunk goes through the same
+cleaning as the in-memory loader and is folded into the aggregate cube (see
+`missions.cube`), which holds the launch counts, rocket price sums and first
+and last launch per combination of dimensions. Peak memory is bounded by the
+chunk size plus the size of the cube, never by the length of the log.
+
+The result equals `build_cube(read_missions(path))`::
+
+    python -m missions.ingest path/to/launches.csv --chunksize 100000
+"""
+import argparse
+import logging
+import time
+
+import pandas as pd
+
+from missions.cube import build_cube, merge_cubes
+from missions.wrangling import DATASET_PATH, clean_missions, name_columns
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNKSIZE = 100000
+
+
+def iter_raw(path=DATASET_PATH, chunksize=DEFAULT_CHUNKSIZE):
+    """Yield raw chunks of the CSV, as strings with the project's column names."""
+    with pd.read_csv(path, dtype=str, chunksize=chunksize) as reader:
+        for chunk in reader:
+            yield name_columns(chunk)
+
+
+def iter_clean(path=DATASET_PATH, chunksize=DEFAULT_CHUNKSIZE):
+    """Yield cleaned chunks, as `clean_missions` would produce them."""
+    for raw in iter_raw(path, chunksize):
+        yield clean_missions(raw)
+
+
+def fold_cube(chunks):
+    """Fold cleaned chunks into one aggregate cube, keeping a single chunk in memory."""
+    cube = None
+    for chunk in chunks:
+        partial = build_cube(chunk)
+        cube = partial if cube is None else merge_cubes([cube, partial])
+    return cube
+
+
+def ingest_cube(path=DATASET_PATH, chunksize=DEFAULT_CHUNKSIZE):
+    """Build the aggregate cube of the CSV at `path` chunk by chunk."""
+    return fold_cube(iter_clean(path, chunksize))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('csv', nargs='?', default=DATASET_PATH, help='launch log to ingest')
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument('--output', help='write the cube to this Feather file')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    start = time.perf_counter()
+    cube = ingest_cube(args.csv, args.chunksize)
+    logger.info(
+        'Ingested %d launches into %d cube cells in %.2fs',
+        cube['launches'].sum(), len(cube), time.perf_counter() - start
+    )
+    if args.output:
+        cube.to_feather(args.output)
+        logger.info('Wrote %s', args.output)
+
+
+if __name__ == '__main__':
+    main()
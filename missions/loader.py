@@ -0,0 +1,177 @@
+"""Cached access to the cleaned missions table for the Streamlit app."""
+import contextlib
+import logging
+import os
+import threading
+import time
+
+import streamlit as st
+
+from missions.incremental import IncrementalTable
+from missions.profiling import timed
+from missions.wrangling import DATASET_PATH
+
+
+logger = logging.getLogger(__name__)
+
+_dataset = DATASET_PATH
+
+_tables = {}
+_tables_lock = threading.Lock()
+
+_refreshers = {}
+_refreshers_lock = threading.Lock()
+
+# Versions a thread is pinned to (see `pinned`), by dataset path.
+_pins = threading.local()
+
+
+def use_dataset(path):
+    """Make `path` the dataset the pages load by default, e.g. in a headless job."""
+    global _dataset
+    _dataset = path
+
+
+def dataset_path():
+    """The CSV the pages currently load."""
+    return _dataset
+
+
+def _published(path):
+    # The `Version` this thread is pinned to, else the last one published
+    # by the refresher of a watched dataset, else None.
+    snapshot = getattr(_pins, 'versions', {}).get(path)
+    if snapshot is not None:
+        return snapshot
+    refresher = _refreshers.get(path)
+    return refresher.current if refresher is not None else None
+
+
+@contextlib.contextmanager
+def pinned(path, snapshot):
+    """Make the loaders of this thread serve `snapshot`, a `missions.refresher.Version` of `path`.
+
+    Used to warm the caches of a version before it is published.
+    """
+    versions = getattr(_pins, 'versions', {})
+    _pins.versions = dict(versions, **{path: snapshot})
+    try:
+        yield snapshot
+    finally:
+        _pins.versions = versions
+
+
+@contextlib.contextmanager
+def pin_current(path=None):
+    """Pin the loaders of this thread to the current version of the dataset, e.g. for a rerun or a request.
+
+    Every `dataset_version`, `load_missions` and `load_cube` call inside the
+    block then sees the same version, so cache keys, filter indexes and data
+    always match, even if the dataset changes meanwhile. For a watched
+    dataset that is the version its refresher published last; otherwise the
+    table is brought up to date on the spot.
+    """
+    path = path or _dataset
+    snapshot = _published(path)
+    if snapshot is None:
+        # Imported here: the refresher pulls in watchdog.
+        from missions.refresher import Version
+
+        # The version is taken before reading, so if the file changes
+        # meanwhile the next block sees a new version.
+        stat = os.stat(path)
+        table = _table(path)
+        table.refresh()
+        df, cube = table.state()
+        snapshot = Version('%d-%d' % (stat.st_mtime_ns, stat.st_size), df, cube, stat.st_mtime, time.time())
+    with pinned(path, snapshot):
+        yield snapshot
+
+
+def dataset_version(path=None):
+    """Cheap fingerprint of the dataset file, used as the cache key.
+
+    For a watched dataset (see `watch_dataset`) this is the version last
+    published by its refresher, which may lag behind the file.
+    """
+    return _current(path or _dataset)[0]
+
+
+def watch_dataset(path=None):
+    """Keep the dataset up to date from a background thread from now on, see `missions.refresher`.
+
+    Returns the dataset's `Refresher`; calling this again is cheap.
+    """
+    path = path or _dataset
+    with _refreshers_lock:
+        if path not in _refreshers:
+            from missions.refresher import Refresher
+            _refreshers[path] = Refresher(_table(path)).start()
+        return _refreshers[path]
+
+
+def _table(path):
+    # One table per dataset for the whole process, shared by every session,
+    # and by headless jobs too, where Streamlit's caches are inactive.
+    with _tables_lock:
+        if path not in _tables:
+            _tables[path] = IncrementalTable(path)
+        return _tables[path]
+
+
+def _current(path):
+    # The version key and the `Version` it belongs to, read once so the two
+    # always match; the `Version` is None for a dataset that is not watched.
+    snapshot = _published(path)
+    if snapshot is not None:
+        return snapshot.version, snapshot
+    stat = os.stat(path)
+    return '%d-%d' % (stat.st_mtime_ns, stat.st_size), None
+
+
+def _refreshed(path, snapshot):
+    # The published table and cube, else the table brought up to date on
+    # the spot. Only called on a cache miss.
+    if snapshot is not None:
+        return snapshot
+    table = _table(path)
+    table.refresh()
+    return table
+
+
+# The `_snapshot` arguments are not hashed: the version identifies them.
+
+@st.cache_data(show_spinner='Loading missions...', max_entries=2)
+def _load_missions(path, version, _snapshot):
+    df = _refreshed(path, _snapshot).df.copy(deep=False)
+    df.attrs['version'] = version
+    logger.info('Loaded %d missions from %s: %s', len(df), path, df.attrs['timings'])
+    return df
+
+
+@timed('load missions')
+def load_missions(path=None):
+    """Return the cleaned missions table, parsing the CSV only when it changes.
+
+    The table comes from the columnar snapshot next to the CSV (see
+    `missions.snapshot`) and is memoized in Streamlit's data cache, keyed on
+    the file's modification time and size. When the CSV grows, only the
+    appended rows are parsed and merged in (see `missions.incremental`).
+    Every caller receives its own copy, so the cached table itself can never
+    be modified by a page. Parse and load timings are available in
+    `df.attrs['timings']`.
+    """
+    path = path or _dataset
+    return _load_missions(path, *_current(path))
+
+
+@st.cache_data(show_spinner=False, max_entries=2)
+def _load_cube(path, version, _snapshot):
+    return _refreshed(path, _snapshot).cube
+
+
+@timed('load cube')
+def load_cube(path=None):
+    """Return the aggregate cube (see `missions.cube`) for the current dataset."""
+    path = path or _dataset
+    return _load_cube(path, *_current(path))
@@ -0,0 +1,30 @@
+"""Registry of the dashboard pages.
+
+Each page lives in its own module exposing `NAME` and `render()`. Modules are
+imported only when their page is selected, so a rerun pays for the imports
+and data preparation of the active page alone. `DEBUG_PAGES` are only listed
+when the app runs with `?debug` in its URL.
+"""
+import importlib
+
+
+PAGES = {
+    'Home': 'missions.pages.home',
+    'About Data': 'missions.pages.about',
+    'Dataset Overview': 'missions.pages.overview',
+    'Interesting Factors': 'missions.pages.factors',
+    'The Cold war': 'missions.pages.cold_war',
+    'Best Every Year': 'missions.pages.best_every_year',
+    'Geo Analysis': 'missions.pages.geo',
+    'India`s Place': 'missions.pages.india',
+    'Launch Forecasts': 'missions.pages.forecast',
+}
+
+DEBUG_PAGES = {
+    'Diagnostics': 'missions.pages.diagnostics',
+}
+
+
+def load_page(name):
+    """Import and return the module implementing page `name`."""
+    return importlib.import_module(PAGES.get(name) or DEBUG_PAGES[name])
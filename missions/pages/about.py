@@ -0,0 +1,28 @@
+"""About Data page: dataset description and the cleaned table, as filtered in the sidebar."""
+import streamlit as st
+
+from missions import filters
+
+
+NAME = 'About Data'
+
+
+def render():
+    df = filters.filtered_missions()
+    st.title("📊" + NAME)
+    st.markdown(''' _The Space Missions Analysis dataset contains information on space missions launched by various countries around the world from 1957 to present. The data includes details such as the launch date, country of origin, rocket used, mission status, and more. The dataset provides valuable insights into the history and trends of space exploration, and can be used to analyze the involvement of different countries in space missions, the success rates of missions, and the evolution of rocket technology over time. Through data visualization, this dataset can help to provide a deeper understanding of the past, present, and future of space exploration._ ''')
+    st.write('## Data Frame')
+    st.dataframe(df)
+    st.markdown("""
+        ### Data Wrangling
+        Cleaning and wrangling the data involves several steps, including:
+
+        - Any duplicate or irrelevant data was removed to ensure that the dataset is accurate and relevant for analysis. In addition, any rows or columns that had null values in the rocket name column were removed since this information is important for analyzing the rocket technology used in each mission. 
+
+        - We have converted the date and time format in the data to a more suitable format that can be effectively analyzed and visualized. This conversion was carried out using the appropriate Python libraries and functions that ensure a professional and accurate handling of the data.
+
+        - In the data wrangling process, the date column was parsed to extract additional information such as month, year, and weekday. This was done to facilitate the visualization of the data by grouping it into different time periods and identifying trends and patterns. 
+
+        - We performed a scaling operation on the price data by multiplying the original values, which ranged from 0 to 1, by a factor of 1,000,000. This was done to convert the values into millions, enabling better comparability and analysis of the data.
+
+    """)
@@ -0,0 +1,96 @@
+"""Best Every Year page: leading countries and companies of every year."""
+import plotly.express as px
+import streamlit as st
+
+from missions.charts import plot
+from missions.cube import rollup
+from missions.filters import filtered_cube
+from missions.queries import top_k_per_group
+
+
+NAME = 'Best Every Year'
+
+
+def render():
+    cube = filtered_cube()
+    st.title("🏆" + NAME)
+    def country_leaders():
+        ds = rollup(cube, ['year', 'country'])[['year', 'country', 'launches']]
+        ds = top_k_per_group(ds, 'year', 'launches')
+        ds.columns = ['year', 'country', 'launches']
+        fig = px.bar(
+            ds, 
+            x="year", 
+            y="launches", 
+            color='country', 
+            title='Leaders by launches for every year (countries)'
+        )
+        return fig
+    plot(NAME, 'country_leaders', country_leaders)
+    
+    #-------------------------------------------------------------------------------------
+    def country_success_leaders():
+        ds = cube[cube['Status Mission']=='Success']
+        ds = rollup(ds, ['year', 'country'])[['year', 'country', 'launches']]
+        ds = top_k_per_group(ds, 'year', 'launches')
+        ds.columns = ['year', 'country', 'launches']
+        fig = px.bar(
+            ds, 
+            x="year", 
+            y="launches", 
+            color='country', 
+            title='Leaders by success launches for every year (countries)',
+            width=800
+        )
+        return fig
+    plot(NAME, 'country_success_leaders', country_success_leaders)
+    st.markdown('''
+    ##### Insights
+
+    - _The USSR was the first country to launch a satellite, Sputnik 1, in 1957, which sparked the space race between the USSR and the USA.The combination of government support, early achievements, and technical expertise helped the USSR establish dominance in space exploration during the 1960s to 1990s._
+
+    - _In recent years, the Chinese government has significantly increased its investment in space exploration, leading to rapid development and progress in China's space technology._
+
+    ''')
+    
+    #----------------------------------------------------------------------------------------
+    def company_leaders():
+        ds = rollup(cube, ['year', 'Company Name'])[['year', 'Company Name', 'launches']]
+        ds = top_k_per_group(ds, 'year', 'launches')
+        ds.columns = ['year', 'company', 'launches']
+        fig = px.bar(
+            ds, 
+            x="year", 
+            y="launches", 
+            color='company', 
+            title='Leaders by launches for every year (companies)',
+            width=800
+        )
+        return fig
+    plot(NAME, 'company_leaders', company_leaders)
+    
+    #---------------------------------------------------------------------------------------
+    def company_success_leaders():
+        ds = cube[cube['Status Mission']=='Success']
+        ds = rollup(ds, ['year', 'Company Name'])[['year', 'Company Name', 'launches']]
+        ds = top_k_per_group(ds, 'year', 'launches')
+        ds.columns = ['year', 'company', 'launches']
+        fig = px.bar(
+            ds, 
+            x="year", 
+            y="launches", 
+            color='company', 
+            title='Leaders by success launches for every year (companies)',
+            width=800
+        )
+        return fig
+    plot(NAME, 'company_success_leaders', company_success_leaders)
+
+
+    st.markdown('''
+    ##### Insights
+
+    - _The US and USSR had a head start in space exploration, with the US launching the first satellite in 1958 and the USSR launching the first human, Yuri Gagarin, into space in 1961. This early lead gave them a significant advantage in terms of experience and knowledge, which allowed them to develop more successful space programs. Additionally, both countries invested heavily in space exploration during the Cold War, which further advanced their programs._
+
+    - _In recent years, companies like SpaceX and CASC have dominated the space industry due to their focus on innovation, cost-cutting measures, and a willingness to take risks. SpaceX, for example, has been able to develop reusable rockets and spacecraft, which has drastically reduced the cost of launching payloads into space._
+    ''')
@@ -0,0 +1,55 @@
+"""Diagnostics page: memory footprint and load timings of the cached tables."""
+import pandas as pd
+import streamlit as st
+
+from missions.geo import unresolved_locations
+from missions.loader import load_cube, load_missions
+from missions import payload
+
+
+NAME = 'Diagnostics'
+
+
+def memory_report(df):
+    """Deep memory usage per column, next to the size of the same column as plain Python objects."""
+    categorical = df.select_dtypes('category').columns
+    plain = df.astype({column: object for column in categorical})
+    return pd.DataFrame({
+        'dtype': df.dtypes.astype(str),
+        'bytes': df.memory_usage(deep=True, index=False),
+        'bytes as objects': plain.memory_usage(deep=True, index=False),
+    })
+
+
+def render():
+    st.title("🩺" + NAME)
+    df = load_missions()
+    cube = load_cube()
+
+    for title, frame in [('Missions table', df), ('Aggregate cube', cube)]:
+        report = memory_report(frame)
+        st.write('## %s' % title)
+        st.write('%d rows, %.2f MB in memory (%.2f MB with object columns instead of categoricals)' % (
+            len(frame), report['bytes'].sum() / 1e6, report['bytes as objects'].sum() / 1e6
+        ))
+        st.dataframe(report)
+
+    st.write('## Unresolved locations')
+    unresolved = unresolved_locations(df)
+    if len(unresolved):
+        st.dataframe(unresolved)
+    else:
+        st.write('Every launch location resolves to an ISO 3166 country or to international waters.')
+
+    st.write('## Figure payloads')
+    payloads = pd.DataFrame(payload.report(), columns=['page', 'chart', 'bytes', 'compact bytes'])
+    if len(payloads):
+        st.write('%d charts built in this process, %.1f kB of figure JSON, %.1f kB after compaction' % (
+            len(payloads), payloads['bytes'].sum() / 1e3, payloads['compact bytes'].sum() / 1e3
+        ))
+        st.dataframe(payloads)
+    else:
+        st.write('No chart has been built in this process yet.')
+
+    st.write('## Load timings')
+    st.write(df.attrs.get('timings', {}))
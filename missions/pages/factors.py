@@ -0,0 +1,306 @@
+"""Interesting Factors page: spending, launch cadence and company experience."""
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+from missions.charts import plot
+from missions.costs import costs
+from missions.cube import distinct, rollup
+from missions.filters import filtered_cube
+from missions.queries import launch_span
+
+
+NAME = 'Interesting Factors'
+
+
+def render():
+    cube = filtered_cube()
+    st.title("🤔" + NAME)
+    def money_by_company():
+        data = costs('Company Name')
+        data = data[data['priced'] > 0]['sum'].reset_index()
+        data.columns = [
+            'company', 
+            'money'
+        ]
+        fig = px.bar(
+            data, 
+            x='company', 
+            y="money", 
+            orientation='v', 
+            title='Total money spent on missions', 
+            width=800,
+            height=500,
+            color='money',
+            color_continuous_scale=px.colors.sequential.YlOrRd,
+            color_continuous_midpoint=data['money'].median()
+        )
+        fig.update_yaxes(title='', showticklabels=False)
+        return fig
+    plot(NAME, 'money_by_company', money_by_company)
+
+    
+    
+    # #----------------------------------------------------------------------------------------
+    def avg_money_by_company():
+        # Averages over the launches with a known price; the hover shows
+        # how many of the launches that is and the spread of the prices.
+        av_money_df = costs('Company Name')
+        av_money_df = av_money_df[av_money_df['priced'] > 0].rename(columns={'mean': 'avg'})
+        av_money_df = av_money_df.reset_index()
+
+        fig = px.bar(
+            av_money_df, 
+            x='Company Name', 
+            y="avg", 
+            orientation='v', 
+            title='Average money per one launch', 
+            width=800,
+            height=500,
+            color='avg',
+            color_continuous_scale=px.colors.sequential.YlOrRd,
+            color_continuous_midpoint=av_money_df['avg'].median(),
+            hover_data={'median': ':.4s', 'q25': ':.4s', 'q75': ':.4s', 'coverage': ':.0%'}
+        )
+
+        fig.update_yaxes(title='', showticklabels=False)
+        return fig
+    plot(NAME, 'avg_money_by_company', avg_money_by_company)
+
+    st.markdown(''' 
+    ##### Insights
+    
+    - _The significant difference in funding between NASA and private companies reflects the different priorities and goals of each entity. NASA's focus on scientific research and pushing the boundaries of space exploration requires significant investment, which is made possible through government funding. Private companies, on the other hand, may focus more on commercial applications of space technology and therefore may not require as much funding._
+    ''')
+    
+    #-----------------------------------------------------------------------------------------
+    def launches_by_year():
+        ds = rollup(cube, ['year'])[['year', 'launches']]
+        ds.columns = ['year', 'count']
+        ds = ds.sort_values('count', ascending=False)
+        colors = ['#3c7ebf'] * len(ds)
+        colors[0] = '#00bfff'
+        bar = go.Bar(
+            x=ds['year'],
+            y=ds['count'],
+            marker=dict(
+                color=colors,
+                line=dict(
+                    color='#000000',
+                    width=1
+                )
+            )
+        )
+        layout = go.Layout(
+            title='Missions number by year',
+            xaxis=dict(
+                title='year',
+                tickmode='linear',
+                tick0=min(ds['year']),
+                dtick=1
+            ),
+            yaxis=dict(
+                title='Number of Missions',
+                showgrid=True,
+                gridwidth=0.5,
+                gridcolor='#c0c0c0',
+                tickmode='linear',
+                tick0=0,
+                dtick=100
+            ),
+            plot_bgcolor='rgba(0,0,0,0)'
+        )
+        fig = go.Figure(data=[bar], layout=layout)
+        return fig
+    plot(NAME, 'launches_by_year', launches_by_year)
+
+    st.markdown('''
+    ##### Insights
+    
+    - _During the period between 1966 and 1978, there was a significant increase in the number of launches primarily driven by the space race between the United States and the Soviet Union. This was a period of intense competition between the two nations, and both were investing heavily in space exploration and technology development._
+
+    - _In recent years, there has been renewed interest in space exploration and commercial space ventures. Private companies such as SpaceX have entered the market and are driving innovation and competition in the industry._
+    ''')
+    
+    #-----------------------------------------------------------------------------------------
+    def launches_by_month():
+        ds = rollup(cube, ['month'])[['month', 'launches']]
+        ds = ds.sort_values('launches', ascending=False)
+        ds.columns = [
+            'month', 
+            'count'
+        ]
+        fig = px.bar(
+            ds, 
+            x='month',
+            y="count", 
+            orientation='v', 
+            title='Missions number by month', 
+            width=800
+        )
+        return fig
+    plot(NAME, 'launches_by_month', launches_by_month)
+    st.markdown('''
+    ##### Insights
+    ''')
+    st.write('- _There is no clear pattern in terms of which days and month have more or fewer launches. Lack of dependence on the month and weekdays may be due to the fact that space agencies and companies have a relatively consistent schedule of launches throughout the year which includes careful planning, preparation, and monitoring to ensure a safe and successful launch._')
+    
+    #---------------------------------------------------------------------------------------
+    def years_since_last_launch():
+        data = launch_span(cube, 'Company Name')
+        data = data.sort_values('last_launch')
+        reference_year = data['last_launch'].max().year
+        fig = go.Figure(go.Bar(
+            x=data['years_since_last'],
+            y=data['Company Name'],
+            orientation='h',
+            marker=dict(
+                color=data['years_since_last'],
+                coloraxis='coloraxis'
+            ),
+            text=data['years_since_last'],
+            textposition='inside',
+            hovertemplate='<b>%{y}</b><br>' +
+                'Years since last start: %{x}<br>' +
+                '<extra></extra>',
+        ))
+        fig.update_layout(
+            title='Years since last Rocket launch from %d' % reference_year,
+            title_x=0.5,
+            font=dict(size=12),
+            width=900,
+            height=1000,
+            xaxis=dict(title='Years'),
+            yaxis=dict(title='Company Name'),
+            coloraxis=dict(
+                colorscale='RdYlGn',
+                colorbar=dict(
+                    title='Years since last start',
+                    titleside='right',
+                    ticks='outside',
+                    ticklen=5,
+                    showticklabels=True
+                )
+            ),
+            plot_bgcolor='rgba(0,0,0,0)'
+        )
+        return fig
+    plot(NAME, 'years_since_last_launch', years_since_last_launch)
+    st.markdown('''
+    ##### Insights
+    ''')
+    st.write("- _Based on the graph, it appears that some of the older companies such as the US Navy and US Air Force have not launched rockets in several decades. Meanwhile, newer countries have emerged and are launching rockets more frequently. This suggests that the landscape of space exploration has shifted over time, with new players entering the field and taking on more active roles._")
+
+    #--------------------------------------------------------------------------------------
+    def avg_money_by_year():
+        money = costs('year')
+        money = money[money['priced'] > 0].rename(columns={'mean': 'Rocket'}).reset_index()
+        fig = px.line(
+            money, 
+            x="year", 
+            y="Rocket",
+            title='Average money spent by year',
+            width=800
+        )
+        fig.update_layout(
+            yaxis_title='Money'
+        )
+        return fig
+    plot(NAME, 'avg_money_by_year', avg_money_by_year)
+    st.markdown('''
+    ##### Insights
+    ''')
+    st.write("- _The average money spent on space exploration was higher between 1980 and 1990 could be the emergence of more nations beyond the US and the USSR entering the field of space exploration. As more countries developed their space programs, there was increased competition and a desire to keep up with the latest advancements in technology. This may have led to more spending on research and development in space exploration, and increased funding for space agencies in these countries._")
+    
+    #--------------------------------------------------------------------------------------
+    def experienced_companies():
+        ds = distinct(cube, ['Company Name'], 'year')
+        ds.columns = ['company','count']
+        ds = ds.sort_values(by='count', ascending=False)
+        fig = px.bar(
+            ds, 
+            x="company", 
+            y="count", 
+            title='Most experienced companies (years of launches)',
+            height = 500,
+            color_discrete_sequence=['#1f77b4']
+        )
+        return fig
+    plot(NAME, 'experienced_companies', experienced_companies)
+    st.markdown('''
+    ##### Insights
+    - _Experience and expertise: Companies with a long history in space exploration, such as NASA, the USSR, General Dynamics and the US Air Force, have accumulated a wealth of experience and knowledge over the years, which can give them an advantage over newer players._
+
+    - _Strategic partnerships: Arianespace has formed partnerships with several European countries to develop the Ariane rocket family, which has helped to establish it as a major player in the industry._
+
+    - _Innovative technology: Companies that are able to develop innovative and cutting-edge technology can gain a competitive advantage in space exploration. SpaceX, for example, has made significant strides in reusable rocket technology, which has helped to reduce launch costs and increase efficiency._
+
+    - _China faced initial setbacks in its early attempts to launch satellites into space during the 18th century, but it persisted with its efforts and continued to make progress. As a result, China has accumulated more years of experience in space exploration despite its initial failures._
+
+
+    ''')
+    
+    #--------------------------------------------------------------------------------------
+    def top5_companies():
+        data = rollup(cube, ['Company Name', 'year'])[['Company Name', 'year', 'launches']]
+        data.columns = [
+            'company', 
+            'year', 
+            'starts'
+        ]
+        top5 = data.groupby(['company'], observed=True)['starts'].sum().reset_index().sort_values('starts', ascending=False).head(5)['company'].tolist()
+        data = data[data['company'].isin(top5)]
+        fig = px.line(
+            data, 
+            x="year", 
+            y="starts", 
+            title='Top 5 companies by number of launches', 
+            color='company'
+        )
+        fig.update_layout(
+            yaxis_title='Launches'
+        )
+        return fig
+    plot(NAME, 'top5_companies', top5_companies)
+    st.markdown('''
+    ##### Insights
+
+    - _The USSR had a significant advantage in rocket technology, with early successes in developing powerful rocket engines and launch vehicles. This combination of government support, early achievements, and technical expertise helped the USSR establish dominance in space exploration during the 1960s to 1990s._
+
+    - _CASC, or the China Aerospace Science and Technology Corporation, was established in 1999 to consolidate China's aerospace industry. In the past, China faced challenges in developing its space technology due to limited resources and access to advanced technology. However, in recent years, the Chinese government has significantly increased its investment in space exploration, leading to rapid development and progress in China's space technology._
+
+    - _One of the primary factors in decline of General Dynamics was the decline in funding for space exploration by the US government. During the 1960s and 1970s, the US government invested heavily in space exploration as part of the Cold War space race against the Soviet Union. However, with the end of the Cold War and a shift in government priorities, funding for space exploration declined significantly._
+
+    - _In 2011 NASA transitioned to relying on commercial space companies like SpaceX and Boeing to transport astronauts to the International Space Station (ISS), rather than developing its own spacecraft. This shift was aimed at reducing the costs and risks of human spaceflight, and allowing NASA to focus on more ambitious goals like returning humans to the Moon and eventually sending humans to Mars._
+
+    - _Compared to other space agencies like NASA and Roscosmos, Arianespace has not been as active in manned missions and deep space exploration. This is partly due to the fact that Arianespace is a commercial launch provider, and its focus is primarily on launching satellites for customers rather than conducting its own space exploration missions._
+
+
+    ''')
+
+    #----------------------------------------------------------------------------------------
+    def starts_2020():
+        data = rollup(cube, ['Company Name', 'year'])[['Company Name', 'year', 'launches']]
+        data.columns = [
+            'company', 
+            'year', 
+            'starts'
+        ]
+        # The latest year in the data (2020 unless filtered).
+        latest = data['year'].max()
+        data = data[data['year']==latest]
+        fig = px.bar(
+            data, 
+            x="company", 
+            y="starts", 
+            title='Number of starts for %d' % latest, 
+            width=800
+        )
+        return fig
+    plot(NAME, 'starts_2020', starts_2020)
+    st.markdown('''
+    ##### Insights
+     - _Private companies like SpaceX have emerged as major players in the space industry in recent years, and they may have taken on more of the rocket launches that were previously done by government agencies._
+
+    - _China has made significant investments in its space program, with a budget of over $8 billion in 2021. This has allowed them to develop advanced space technologies, including the Long March rockets, which have a high success rate and can carry heavy payloads._
+    ''')
@@ -0,0 +1,76 @@
+"""Launch Forecasts page: launch cadence forecasts per country or company."""
+import plotly.graph_objects as go
+import streamlit as st
+
+from missions.charts import plot
+from missions.forecast import HORIZONS, INTERVAL_ALPHA, ORDER, forecast_frame, forecasts
+
+
+NAME = 'Launch Forecasts'
+
+
+def render():
+    st.title("🔮" + NAME)
+    st.write('_ARIMA%s models fitted to the launches of every country or company with enough launches, forecasting the next %d years or %d months. Bands show the %d%% forecast interval._' % (
+        ORDER, HORIZONS['yearly'], HORIZONS['monthly'], round((1 - INTERVAL_ALPHA) * 100)))
+
+    dimension = st.radio('Forecast', ['Countries', 'Companies'], horizontal=True)
+    by = 'country' if dimension == 'Countries' else 'Company Name'
+    freq = st.selectbox('Frequency', list(HORIZONS), format_func=str.capitalize)
+    series, fits, fitted = forecasts(by, freq)
+    frame = forecast_frame(series, fits, freq)
+    if not len(frame):
+        st.write('No %s has enough launches to forecast.' % dimension.lower()[:-1])
+        return
+    st.caption('%d series, %d fitted for this data, the rest from the fit cache.' % (len(series), fitted))
+
+    ranked = frame.groupby('member')['launches'].sum().sort_values(ascending=False).index.tolist()
+    members = st.multiselect(dimension, ranked, default=ranked[:4])
+    colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', '#8c564b', '#e377c2', '#7f7f7f', '#bcbd22', '#17becf']
+    def launch_forecast():
+        fig = go.Figure()
+        for i, member in enumerate(members):
+            color = colors[i % len(colors)]
+            ds = frame[frame['member'] == member]
+            future = ds[ds['forecast'].notna()]
+            fig.add_trace(go.Scatter(
+                x=list(future['period']) + list(future['period'])[::-1],
+                y=list(future['upper']) + list(future['lower'])[::-1],
+                fill='toself',
+                fillcolor=color,
+                opacity=0.2,
+                line=dict(width=0),
+                hoverinfo='skip',
+                showlegend=False,
+                legendgroup=member
+            ))
+            fig.add_trace(go.Scatter(x=ds['period'], y=ds['launches'], name=member, line=dict(color=color), legendgroup=member))
+            fig.add_trace(go.Scatter(
+                x=future['period'],
+                y=future['forecast'],
+                name='%s (forecast)' % member,
+                line=dict(color=color, dash='dash'),
+                legendgroup=member,
+                showlegend=False
+            ))
+        fig.update_layout(
+            title='%s launches and forecast' % freq.capitalize(),
+            xaxis_title='Year' if freq == 'yearly' else 'Month',
+            yaxis_title='Number of Launches',
+            height=500,
+            width=800
+        )
+        return fig
+    if members:
+        plot(NAME, 'launch_forecast', launch_forecast, by=by, freq=freq, members=tuple(members))
+
+    #-----------------------------------------------------------------------------------------
+    st.markdown('''
+    ##### Models
+    ''')
+    summary = frame.groupby('member').agg(
+        launches=('launches', 'sum'),
+        next_period=('forecast', lambda forecast: forecast.dropna().iloc[1]),
+    )
+    summary['aic'] = [fits[member]['aic'] for member in summary.index]
+    st.dataframe(summary.loc[ranked].round(2))
@@ -0,0 +1,164 @@
+"""Geo Analysis page: launches by country, company and status, and world maps."""
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+from missions.charts import plot
+from missions.cube import rollup
+from missions.choropleth import MAP_METRICS, map_frames, pivot
+from missions.filters import filtered_cube
+from missions.payload import FIGURE_TOP_N
+from missions.queries import top_n_other
+
+
+NAME = 'Geo Analysis'
+
+
+def render():
+    cube = filtered_cube()
+    st.title("🗺️" + NAME)
+    st.write('_The sunburst chart visualizes the number of rockets launched by different companies in various countries, along with the mission status of each launch. The chart is divided into three concentric circles, with the innermost circle representing countries, the middle circle representing companies within each country, and the outer circle representing the mission status of each launch._')
+    def sunburst():
+        sun = rollup(cube, ['country', 'Company Name', 'Status Mission'])[['country', 'Company Name', 'Status Mission', 'launches']]
+        sun.columns = [
+            'country', 
+            'company', 
+            'status', 
+            'count'
+        ]
+        sun = top_n_other(sun, 'company', 'count', FIGURE_TOP_N, by='country')
+        fig = px.sunburst(
+            sun, 
+            path=[
+                'country', 
+                'company', 
+                'status'
+            ], 
+            values='count', 
+            title='Sunburst chart for all countries',
+            width=800,
+            height=500 
+        )
+        fig.update_layout(margin=dict(l=0, r=0, t=30, b=0))
+        return fig
+    plot(NAME, 'sunburst', sunburst, top=FIGURE_TOP_N)
+    
+    st.markdown(''' 
+    ##### Insights
+      - _The disparity in the number of launches by the USSR and the US compared to other countries can be attributed to a combination of early development, budgetary constraints, technology transfer, and international cooperation. However, in recent years, other countries like China, India, and Japan have been investing heavily in their space programs and are catching up in terms of the number of launches and achievements in space exploration._
+    ''')
+    
+    
+    #--------------------------------------------------------------------------------------------     
+    def plot_map(mapdf, target_column, title, width=800, height=600, color_scale='Viridis'):
+        mapdf = mapdf.rename(columns={'launches': target_column})
+        fig = px.choropleth(
+            mapdf, 
+            locations="alpha3", 
+            hover_name="country", 
+            color=target_column, 
+            projection="natural earth", 
+            width=width, 
+            height=height,
+            color_continuous_scale=color_scale,
+            range_color=[0, mapdf[target_column].max()],
+            title=title,
+            template='plotly_dark'
+        )
+        fig.update_geos(
+            showcountries=True,
+            countrycolor="white",
+            showocean=True,
+            oceancolor="MidnightBlue",
+            showcoastlines=True,
+            coastlinecolor="white",
+            showland=True,
+            landcolor="LightGrey"
+        )
+        return fig
+    
+    plot(NAME, 'launch_map', lambda: plot_map(
+        mapdf=pivot().totals(),
+        target_column='Status Mission', 
+        title='Number of launches per country',
+        color_scale='YlOrRd'
+    ))
+    st.markdown(''' 
+    ##### Insights
+    - _A world heat map that shows the number of space missions by country can provide valuable insights into the distribution of space exploration activity around the world.In this case, the map shows that the USSR and the US have had significantly more space missions than other countries.However, the map also shows that other countries like China, India, and Japan are becoming increasingly active in space exploration and are catching up to the US and the USSR in terms of the number of missions._
+    ''')
+
+    plot(NAME, 'failure_map', lambda: plot_map(
+        mapdf=pivot().totals('Failure'),
+        target_column='Status Mission', 
+        title='Number of Fails per country',
+        color_scale='YlOrRd'
+    ))
+    st.markdown(''' 
+    ##### Insights
+    _The higher success rate of the USSR's space program may have been due to a combination of factors, including factors such as_
+
+    - _The Soviet Union's space program was often characterized by a focus on simplicity and reliability._
+
+    - _The Soviet Union was known for placing a high priority on the safety of its cosmonauts and spacecraft._
+
+    - _The Soviet Union invested heavily in its launch infrastructure, building a network of launch facilities and associated infrastructure that could support a wide range of missions._
+
+    ''')
+
+    #--------------------------------------------------------------------------------------------
+    st.markdown('''
+    ##### Launches over time
+    ''')
+    metric = st.selectbox('Metric', list(MAP_METRICS), format_func=MAP_METRICS.get)
+    cumulative = st.checkbox('Cumulative', value=True)
+    def animated_map():
+        frames, color_range = map_frames(metric, cumulative)
+        source = pivot()
+        fig = go.Figure(
+            data=[go.Choropleth(
+                locations=source.alpha3,
+                text=source.countries,
+                z=frames[-1]['data'][0]['z'],
+                zmin=color_range[0],
+                zmax=color_range[1],
+                colorscale='YlOrRd',
+                colorbar=dict(title=MAP_METRICS[metric]),
+                hovertemplate='<b>%{text}</b><br>%{z}<extra></extra>'
+            )],
+            frames=[go.Frame(frame) for frame in frames]
+        )
+        steps = [
+            dict(method='animate', label=frame['name'], args=[[frame['name']], dict(mode='immediate', frame=dict(duration=0, redraw=True))])
+            for frame in frames
+        ]
+        fig.update_layout(
+            title='%s per country by year%s' % (MAP_METRICS[metric], ' (cumulative)' if cumulative else ''),
+            width=800,
+            height=600,
+            template='plotly_dark',
+            updatemenus=[dict(
+                type='buttons',
+                showactive=False,
+                x=0.05,
+                y=0.05,
+                buttons=[
+                    dict(label='Play', method='animate', args=[None, dict(frame=dict(duration=300, redraw=True), fromcurrent=True)]),
+                    dict(label='Pause', method='animate', args=[[None], dict(mode='immediate', frame=dict(duration=0, redraw=False))])
+                ]
+            )],
+            sliders=[dict(active=len(steps) - 1, steps=steps, x=0.15, len=0.85, currentvalue=dict(prefix='Year: '))]
+        )
+        fig.update_geos(
+            projection_type='natural earth',
+            showcountries=True,
+            countrycolor="white",
+            showocean=True,
+            oceancolor="MidnightBlue",
+            showcoastlines=True,
+            coastlinecolor="white",
+            showland=True,
+            landcolor="LightGrey"
+        )
+        return fig
+    plot(NAME, 'animated_map', animated_map, metric=metric, cumulative=cumulative)
@@ -0,0 +1,19 @@
+"""Home page: project title and credits."""
+from PIL import Image
+import streamlit as st
+
+
+NAME = 'Home'
+
+
+def render():
+    st.title("🏠" + NAME)
+    st.header(' **Data Analytics and Visualization Project** ')
+    st.write('')
+    
+    image = Image.open("images/space_rocket.png")
+    st.image(image,width=600)
+    url1 = "https://www.linkedin.com/in/nishesh-jain/"
+    url2 = "https://github.com/nisheshjain12"
+    st.write(" By - Nishesh Jain [link](%s)" % url1 )
+    st.write(" GitHub -  [link](%s)" % url2 )
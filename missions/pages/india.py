@@ -0,0 +1,134 @@
+"""India`s Place page: India's space program compared with the USA."""
+import plotly.express as px
+import streamlit as st
+
+from missions.charts import plot
+from missions.compare import ROLLING_YEARS, comparison
+from missions.filters import filtered_cube
+
+
+NAME = 'India`s Place'
+
+
+def render():
+    cube = filtered_cube()
+    st.title("" + NAME)
+    st.markdown('''
+
+    - _India and the United States have different histories and circumstances that have impacted their respective space exploration programs. The US has been a pioneer in space exploration, with NASA being established in 1958 and playing a significant role in space exploration since then._
+
+    - _In contrast, India's space program started much later, with the establishment of the Indian Space Research Organisation (ISRO) in 1969. ISRO has faced challenges due to limited funding, technology, and infrastructure, which have hindered its progress in space exploration compared to the US._
+
+    ''')
+
+    compare = comparison('country', ['India', 'USA'], since=1979)
+    def launches_by_country():
+        ds = compare.groupby('country')['launches'].sum().reset_index()
+        ds.columns = ['country', 'count']
+        ds = ds.sort_values('count', ascending=False)
+        colors = ['#1f77b4', '#ff7f0e']
+
+        fig = px.pie(ds, 
+                    names='country', 
+                    values='count', 
+                    title='Number of Launches',
+                    hole=0.5,
+                    color_discrete_sequence=colors,
+                    labels={'count': 'Number of Launches'},
+                    width=700, 
+                    height=500)
+        fig.update_traces(textposition='inside', textinfo='percent+label')
+        fig.update_layout(title_font=dict(size=20, color='white', family='Arial'))
+        return fig
+    plot(NAME, 'launches_by_country', launches_by_country)
+
+    #-----------------------------------------------------------------------------------
+    def launches_by_year():
+        ds = compare[['year', 'country', 'launches']]
+        ds.columns = ['year', 'country', 'Launches']
+        colors = ['rgb(255, 128, 0)', 'rgb(53, 83, 255)']
+        fig = px.line(
+            ds, 
+            x="year", 
+            y="Launches", 
+            color='country', 
+            title='USA vs India: Launches Year by Year',
+            color_discrete_sequence=colors, # Set custom color palette
+            labels={'year': 'Year', 'Launches': 'Number of Launches', 'country': 'Country'}, # Rename labels
+            height=500, 
+            width=800
+        )
+        fig.update_xaxes(tickfont=dict(size=10))
+        fig.update_layout(
+            legend=dict(
+                title=None,
+                orientation='h',
+                yanchor='top',
+                y=1.1,
+                xanchor='left',
+                x=0.75,
+                font=dict(size=14),
+                title_font=dict(size=20, color='white', family='Arial')
+            )
+        )
+        return fig
+    plot(NAME, 'launches_by_year', launches_by_year)
+    st.markdown('''
+    ##### Insights
+
+    -  _India, on the other hand, has faced political and economic instability, which has affected its ability to invest in space exploration._
+
+    - _Additionally, the geographic location of the two countries also plays a role. The US has easy access to space, with the presence of several launch sites. In contrast, India's location farther from the equator and lack of launch sites has made it more challenging to launch and access space._
+    ''')
+
+    #-----------------------------------------------------------------------------------------
+    def mean_success():
+        ds_mean = compare.groupby('country')['success_rate'].mean().reset_index()
+        ds_mean.columns = ['country', 'Success_pct']
+    
+        fig = px.pie(ds_mean, 
+             values='Success_pct', 
+             names='country',
+             title='Mean Success Percentage for USA vs India',
+             color_discrete_sequence=['#1f77b4', '#ff7f0e'], 
+             hole=0.5,
+             labels={'country': 'Country', 'Success_pct': 'Mean Success Percentage'},
+             width=700, 
+             height=500)
+        fig.update_traces(textposition='inside', textinfo='percent+label')
+        fig.update_layout(title_font=dict(size=20, color='white', family='Arial'))
+        return fig
+    plot(NAME, 'mean_success', mean_success)
+    st.markdown('''
+    ##### Insights
+
+    -  _India has a higher failure rate than the United States when it comes to space missions. This can be attributed to several factors, including the fact that India is still relatively new to the field of space exploration and is still developing its capabilities in this area._
+    
+    - _Additionally, India operates on a much smaller budget than the United States, which can impact the quality and reliability of its space missions._
+
+    - _India's space exploration program has faced numerous political and geographic challenges over the years. For example, India has faced sanctions from other countries due to its nuclear program, which has impacted its ability to access certain technologies and resources needed for space exploration._
+    ''')
+
+    #-----------------------------------------------------------------------------------------
+    st.markdown('''
+    ##### Compare other programs
+    ''')
+    dimension = st.radio('Compare', ['Countries', 'Companies'], horizontal=True)
+    by, label = ('country', 'Country') if dimension == 'Countries' else ('Company Name', 'Company')
+    options = sorted(cube[by].dropna().unique())
+    members = st.multiselect(dimension, options, default=[m for m in ['India', 'USA'] if m in options])
+    programs = comparison(by, sorted(members))
+    def rolling_success():
+        fig = px.line(
+            programs,
+            x='year',
+            y='rolling_success_rate',
+            color=by,
+            title='Success rate over the last %d years' % ROLLING_YEARS,
+            labels={'year': 'Year', 'rolling_success_rate': 'Success rate (%)', by: label},
+            height=500,
+            width=800
+        )
+        return fig
+    if members:
+        plot(NAME, 'rolling_success', rolling_success, by=by, members=tuple(sorted(members)))
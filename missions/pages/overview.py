@@ -0,0 +1,144 @@
+"""Dataset Overview page: launches per company and rocket/mission status."""
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+from missions.charts import plot
+from missions.cube import rollup
+from missions.filters import filtered_cube
+from missions.payload import FIGURE_TOP_N
+from missions.queries import top_n_other
+
+
+NAME = 'Dataset Overview'
+
+
+def render():
+    cube = filtered_cube()
+    st.title("🌐" + NAME)
+    st.write(' _The higher number of rocket launches by certain countries can be attributed to a combination of historical context, technological advancements, and military applications._')
+    def launches_by_company():
+        ds = rollup(cube, ['Company Name'])[['Company Name', 'launches']]
+        ds.columns = ['Company', 'Number of Launches']
+        ds = top_n_other(ds, 'Company', 'Number of Launches', FIGURE_TOP_N)
+        ds = ds.sort_values(['Number of Launches'], ascending=False)
+        fig = px.treemap(ds, 
+                        path=['Company'], 
+                        values='Number of Launches', 
+                        color='Number of Launches',
+                        color_continuous_scale='YlOrRd',
+                        title='Number of Launches by Every Company',
+                        hover_data={'Number of Launches': ':d', 'Company': False},
+                        custom_data=['Number of Launches'])
+        fig.update_traces(
+            hovertemplate='<br>'.join([
+                'Company: %{label}',
+                'Number of Launches: %{customdata[0]}'
+            ]),
+            hoverlabel=dict(
+            bgcolor="yellow",
+            font=dict(size=12, color = "black")
+            ),
+            marker=dict(cornerradius=15)
+        )
+        fig.update_layout(height = 400,
+                          margin = dict(t=50, l=25, r=25, b=2))
+        return fig
+    plot(NAME, 'launches_by_company', launches_by_company, top=FIGURE_TOP_N)
+    
+    st.markdown('''
+    ##### Insights
+
+    - _**Historical Context**_: _The USSR and the USA were in a space race during the Cold War, which fueled significant investment in space exploration and a high number of rocket launches. Since then, these two countries have continued to maintain a strong presence in space exploration._
+
+    - _**Technological Advancements**_: _NASA, Boeing, and SpaceX are all major players in the commercial space industry and have developed advanced rocket technology. This has allowed them to launch a larger number of rockets and achieve higher success rates than other countries._
+
+    - _**Military Applications**_: _The US Air Force has been involved in launching rockets for military applications, such as spy satellites and communication networks, which require a high number of launches._
+
+    ''')
+
+    #--------------------------------------------------------------------------------------------------
+    def rocket_status():
+        ds = rollup(cube, ['Status Rocket'])[['Status Rocket', 'launches']]
+        ds.columns = ['status', 'count']
+        ds = ds.sort_values('count', ascending=False)
+
+        colors = ['rgb(75, 109, 153)', 'rgb(232, 114, 114)']
+
+        fig = go.Figure(
+            go.Pie(
+                labels=ds['status'], 
+                values=ds['count'],
+                hole=0.5,
+                marker=dict(colors=colors), 
+                textfont=dict(size=14, color='black'),
+                hoverinfo='label+percent',
+                textinfo='label+percent'
+            )
+        )
+        fig.update_layout(
+            title=dict(
+                text='Rocket Status',
+                font=dict(size=20)
+            ),
+            font=dict(
+                family='Arial',
+                size=16,
+                color='black'
+            ),
+            height=470
+        )
+        return fig
+    plot(NAME, 'rocket_status', rocket_status)
+    st.markdown(''' 
+    ##### Insights
+    - _The fact that around 80% of rockets are not currently in use highlights the fact that historically rockets were designed as expendable vehicles, meaning they were only intended to be used once and then discarded. This resulted in a significant amount of waste and high launch costs, as a new rocket had to be built for each launch._
+    ''')
+    
+    #---------------------------------------------------------------------------------------------
+    def mission_status():
+        ds = rollup(cube, ['Status Mission'])[['Status Mission', 'launches']]
+        ds.columns = ['mission_status', 'count']
+        ds = ds.sort_values('count', ascending=False)
+
+        colors = ['#FFC300', '#FF5733', '#C70039', '#900C3F', '#581845']
+        fig = px.bar(ds, 
+                    x='mission_status', 
+                    y='count', 
+                    title='Mission Status Distribution',
+                    color='mission_status',
+                    color_discrete_sequence=colors,
+                    height=500, 
+                    width=800
+                    )
+        fig.update_layout(
+            plot_bgcolor='rgba(0,0,0,0)', 
+            xaxis=dict(
+                title='',
+                showgrid=True,
+                gridcolor='lightgray',
+                gridwidth=0.1,
+                tickfont=dict(size=12)
+            ),
+            yaxis=dict(
+                title='Count',
+                showgrid=True,
+                gridcolor='lightgray',
+                gridwidth=0.1,
+                tickfont=dict(size=12),
+                automargin=True
+            ),
+            font=dict(
+                family='Arial',
+                size=14,
+                color='black'
+            ),
+            margin=dict(l=0, r=0, t=50, b=0)
+        )
+        return fig
+    plot(NAME, 'mission_status', mission_status)
+    st.markdown('''
+    ##### Insights
+     - _The high success rates of missions were likely due to a combination of technological advancements, rigorous testing and quality control procedures, experience and expertise, and strategic importance._
+
+    ''')
@@ -0,0 +1,112 @@
+"""Smaller figure payloads for the browser.
+
+Every chart is sent to the browser as figure JSON on each rerun, so for
+remote viewers page switches are dominated by payload size. Before a figure
+is cached (see `missions.charts.plot`) its traces are compacted:
+
+- numeric sequences (of the traces and of animation frames) become numpy
+  arrays, integral floats become integers (``61`` instead of ``61.0``) and
+  other floats are rounded to `FIGURE_DIGITS` significant digits, about
+  float32 precision;
+- the layout template keeps trace defaults only for the trace types the
+  figure uses (the Streamlit template carries defaults for ten types);
+- categorical charts with many leaves (the treemap and the sunburst) can be
+  limited to their `FIGURE_TOP_N` largest labels plus an "Other" bucket,
+  see `missions.queries.top_n_other`. This is off by default.
+
+The rest of the layout is left alone; the Streamlit theme is applied through
+the template it carries. Plotly.js in Streamlit 1.21 (2.6) cannot decode
+base64-encoded typed arrays, so numeric traces stay plain JSON arrays.
+
+The size of each chart before and after compaction is kept for the
+Diagnostics page, see `report()`.
+"""
+import math
+import os
+import threading
+
+import numpy as np
+import plotly.graph_objects as go
+
+
+# Significant digits kept for non-integral floats in figure data.
+FIGURE_DIGITS = int(os.environ.get('MISSIONS_FIGURE_DIGITS', 7))
+
+# Labels kept by the treemap and sunburst before the rest is bucketed as
+# "Other"; 0 keeps every label.
+FIGURE_TOP_N = int(os.environ.get('MISSIONS_FIGURE_TOP_N', 0))
+
+_sizes = {}
+_sizes_lock = threading.Lock()
+
+
+def _is_number(value):
+    return isinstance(value, (int, float, np.number)) and not isinstance(value, (bool, np.bool_))
+
+
+def compact_array(values, digits=FIGURE_DIGITS):
+    """Return a numeric sequence as the shortest-printing numpy array, or None if it is not numeric."""
+    if isinstance(values, np.ndarray):
+        if values.ndim != 1 or values.dtype.kind not in 'iuf':
+            return None
+        array = values
+    elif isinstance(values, (list, tuple)) and values and all(_is_number(value) for value in values):
+        array = np.asarray(values)
+    else:
+        return None
+
+    if array.dtype.kind in 'iu':
+        return array
+    finite = np.isfinite(array)
+    if finite.all() and (array == np.round(array)).all() and np.abs(array).max() < 2 ** 53:
+        return array.astype(np.int64)
+    magnitude = np.abs(array[finite]).max() if finite.any() else 0
+    if magnitude == 0:
+        return array
+    # Round to `digits` significant digits of the largest value, so every
+    # value of the trace is on the same grid.
+    decimals = digits - 1 - math.floor(math.log10(magnitude))
+    array = np.round(array, decimals)
+    if decimals <= 0 and finite.all() and magnitude < 2 ** 53:
+        return array.astype(np.int64)
+    return array
+
+
+def _compact(node, digits):
+    for key, value in node.items():
+        if isinstance(value, dict):
+            _compact(value, digits)
+            continue
+        array = compact_array(value, digits)
+        if array is not None:
+            node[key] = array
+
+
+def compact_figure(fig, digits=FIGURE_DIGITS):
+    """Return a copy of `fig` with compacted trace data."""
+    spec = fig.to_dict()
+    for trace in spec['data']:
+        _compact(trace, digits)
+    for frame in spec.get('frames', []):
+        for trace in frame.get('data', []):
+            _compact(trace, digits)
+    template = spec['layout'].get('template', {})
+    if 'data' in template:
+        used = {trace.get('type', 'scatter') for trace in spec['data']}
+        template['data'] = {kind: value for kind, value in template['data'].items() if kind in used}
+    return go.Figure(spec, _validate=False)
+
+
+def record(page, chart, before, after):
+    """Remember the payload size of a chart before and after compaction."""
+    with _sizes_lock:
+        _sizes[page, chart] = (before, after)
+
+
+def report():
+    """Payload sizes of every chart compacted so far in this process."""
+    with _sizes_lock:
+        return [
+            {'page': page, 'chart': chart, 'bytes': before, 'compact bytes': after}
+            for (page, chart), (before, after) in sorted(_sizes.items())
+        ]
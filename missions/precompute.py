@@ -0,0 +1,120 @@
+"""Precompute every dashboard figure offline, across a process pool.
+
+Every page is rendered headlessly for each dataset given on the command line
+and the figures it plots are written as versioned artifacts (see
+`missions.artifacts`). The app loads those instead of preparing the data and
+building the figures while serving a request::
+
+    python -m missions.precompute [csv ...] [--jobs 4] [--output artifacts/]
+
+Pages, and datasets, are independent of each other, so each (dataset, page)
+pair is a separate task. Versions that already have a complete set of
+artifacts are skipped unless `--force` is given.
+"""
+import argparse
+import logging
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import plotly
+
+from missions.artifacts import (
+    ARTIFACTS_DIR, MANIFEST, artifact_dir, code_digest, dataset_digest, write_artifact, write_manifest
+)
+from missions.pages import PAGES
+from missions.snapshot import load_snapshot
+from missions.wrangling import DATASET_PATH, SCHEMA_VERSION
+
+
+logger = logging.getLogger(__name__)
+
+
+def prepare_dataset(path):
+    """Make sure the snapshot of `path` is fresh before the pages read it concurrently."""
+    return len(load_snapshot(path))
+
+
+def precompute_page(path, page, directory):
+    """Render `page` headlessly on the dataset at `path` and write its figures under `directory`."""
+    # Imported here so the parent process never pays for Streamlit.
+    from missions import charts
+    from missions.loader import use_dataset
+    from missions.pages import load_page
+
+    use_dataset(path)
+    start = time.perf_counter()
+    with charts.capture() as figures:
+        load_page(page).render()
+    for chart, params, fig in figures:
+        write_artifact(directory, page, chart, fig, **params)
+    return page, [chart for chart, params, fig in figures], time.perf_counter() - start
+
+
+def precompute(paths, jobs=None, root=ARTIFACTS_DIR, force=False):
+    """Write the artifacts of every page for each dataset in `paths`.
+
+    Returns the version directories that were written.
+    """
+    targets = {}
+    for path in paths:
+        directory = artifact_dir(path, root)
+        if not force and os.path.exists(os.path.join(directory, MANIFEST)):
+            logger.info('%s is up to date for %s', directory, path)
+            continue
+        if directory in targets.values():
+            continue
+        targets[path] = directory
+
+    written = []
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        list(pool.map(prepare_dataset, targets))
+
+        # Pages are written to a scratch directory that replaces the version
+        # directory at the end, so the app never sees half a version.
+        scratch = {path: '%s.%d.tmp' % (directory, os.getpid()) for path, directory in targets.items()}
+        tasks = {
+            path: [pool.submit(precompute_page, path, page, scratch[path]) for page in PAGES]
+            for path in targets
+        }
+        for path, futures in tasks.items():
+            pages = {}
+            for future in futures:
+                page, charts, seconds = future.result()
+                pages[page] = charts
+                logger.info('%s: %s, %d figures in %.2fs', os.path.basename(path), page, len(charts), seconds)
+
+            os.makedirs(scratch[path], exist_ok=True)
+            write_manifest(scratch[path], {
+                'dataset': os.path.abspath(path),
+                'digest': dataset_digest(path),
+                'schema': SCHEMA_VERSION,
+                'code': code_digest(),
+                'plotly': plotly.__version__,
+                'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+                'pages': pages,
+            })
+            shutil.rmtree(targets[path], ignore_errors=True)
+            os.replace(scratch[path], targets[path])
+            logger.info('Wrote %s', targets[path])
+            written.append(targets[path])
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('csv', nargs='*', default=[DATASET_PATH], help='dataset CSVs to precompute')
+    parser.add_argument('--jobs', type=int, help='worker processes (default: one per CPU)')
+    parser.add_argument('--output', default=ARTIFACTS_DIR, help='artifacts directory')
+    parser.add_argument('--force', action='store_true', help='rebuild versions that are already complete')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    start = time.perf_counter()
+    precompute(args.csv, args.jobs, args.output, args.force)
+    logger.info('Done in %.2fs', time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    main()
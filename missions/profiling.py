@@ -0,0 +1,91 @@
+"""Opt-in timing of the stages of a rerun.
+
+Profiling is off unless the `MISSIONS_PROFILE` environment variable is set or
+the app is opened with `?profile` in its URL. The app calls `start()` at the
+top of each rerun; `stage()` blocks and `timed()` functions then record their
+wall time, nested stages indented under the enclosing one, and the sidebar
+shows the list at the end of the rerun. With `cprofile` as the value
+(`MISSIONS_PROFILE=cprofile` or `?profile=cprofile`) the whole rerun also
+runs under cProfile and its stats are dumped to `PROFILE_DIR`.
+
+Recording is per thread, i.e. per session rerun. When profiling is off,
+`stage()` returns a shared no-op context and `timed()` functions make a
+single attribute lookup before calling through.
+"""
+import contextlib
+import cProfile
+import functools
+import io
+import os
+import pstats
+import tempfile
+import threading
+import time
+
+
+PROFILE = os.environ.get('MISSIONS_PROFILE', '')
+
+PROFILE_DIR = os.environ.get('MISSIONS_PROFILE_DIR', os.path.join(tempfile.gettempdir(), 'missions-profiles'))
+
+_local = threading.local()
+_disabled = contextlib.nullcontext()
+
+
+def start(mode=PROFILE):
+    """Start recording the stages of this rerun; a false `mode` turns recording off."""
+    _local.records = [] if mode else None
+    _local.depth = 0
+
+
+def records():
+    """(depth, stage, seconds) for every stage recorded since `start`, in start order."""
+    return getattr(_local, 'records', None) or []
+
+
+@contextlib.contextmanager
+def _record(name):
+    entry = [_local.depth, name, None]
+    _local.records.append(entry)
+    _local.depth += 1
+    begin = time.perf_counter()
+    try:
+        yield
+    finally:
+        entry[2] = time.perf_counter() - begin
+        _local.depth -= 1
+
+
+def stage(name):
+    """Context manager timing the block it wraps as stage `name`."""
+    if getattr(_local, 'records', None) is None:
+        return _disabled
+    return _record(name)
+
+
+def timed(name):
+    """Decorator timing every call of the function as stage `name`."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if getattr(_local, 'records', None) is None:
+                return func(*args, **kwargs)
+            with _record(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def run_profiled(func, lines=30):
+    """Run `func` under cProfile, dump the stats to `PROFILE_DIR`.
+
+    Returns the path of the dump and the top `lines` functions by cumulative
+    time, as text.
+    """
+    profile = cProfile.Profile()
+    profile.runcall(func)
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    path = os.path.join(PROFILE_DIR, 'rerun-%s-%d.prof' % (time.strftime('%Y%m%d-%H%M%S'), threading.get_ident()))
+    profile.dump_stats(path)
+    out = io.StringIO()
+    pstats.Stats(profile, stream=out).sort_stats('cumulative').print_stats(lines)
+    return path, out.getvalue()
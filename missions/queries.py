@@ -0,0 +1,103 @@
+"""Reusable vectorized queries over the missions table and its aggregates."""
+import numpy as np
+import pandas as pd
+
+from missions.cube import rollup
+from missions.profiling import timed
+
+
+TIE_POLICIES = ('first', 'last', 'all')
+
+
+@timed('top k per group')
+def top_k_per_group(frame, group, value, k=1, ties='first'):
+    """Return the `k` rows with the largest `value` within each `group`.
+
+    Rows come back ordered by `group` ascending, then by `value` descending.
+    `ties` decides which rows win when values tie at the k-th place:
+
+    - ``'first'``: rows that appear earlier in `frame` win
+    - ``'last'``: rows that appear later in `frame` win
+    - ``'all'``: every tied row is kept, so a group may return more than `k`
+
+    The query is a single stable `np.lexsort` over the factorized group keys
+    followed by array arithmetic, so its Python overhead does not depend on
+    the number of groups.
+    """
+    if ties not in TIE_POLICIES:
+        raise ValueError('ties must be one of %s, got %r' % (TIE_POLICIES, ties))
+    if isinstance(group, str):
+        group = [group]
+    if ties == 'last':
+        frame = frame.iloc[::-1]
+    if frame.empty:
+        return frame
+
+    codes = [pd.factorize(frame[column], sort=True)[0] for column in group]
+    values = frame[value].to_numpy(dtype=np.float64)
+    order = np.lexsort([-values] + codes[::-1])
+
+    sorted_codes = [c[order] for c in codes]
+    boundary = np.zeros(len(order), dtype=bool)
+    boundary[0] = True
+    for c in sorted_codes:
+        boundary[1:] |= c[1:] != c[:-1]
+    starts = np.flatnonzero(boundary)
+    group_index = np.cumsum(boundary) - 1
+    position = np.arange(len(order)) - starts[group_index]
+
+    if ties == 'all':
+        sizes = np.diff(np.append(starts, len(order)))
+        sorted_values = values[order]
+        threshold = sorted_values[starts + np.minimum(k, sizes) - 1]
+        keep = sorted_values >= threshold[group_index]
+    else:
+        keep = position < k
+    return frame.iloc[order[keep]]
+
+
+@timed('launch span')
+def launch_span(cube, by, reference=None):
+    """First and last launch of every `by` entity (e.g. company or country).
+
+    Works on the aggregate cube, so the cost is one grouped min/max whatever
+    the order of the underlying launch log. `years_since_last` counts
+    calendar years between the entity's last launch and `reference`, which
+    defaults to the latest launch in `cube`.
+    """
+    keys = [by] if isinstance(by, str) else list(by)
+    span = rollup(cube, keys)[keys + ['first_launch', 'last_launch']]
+    if reference is None:
+        reference = span['last_launch'].max()
+    reference = pd.Timestamp(reference)
+    span['years_since_last'] = reference.year - span['last_launch'].dt.year
+    return span
+
+
+@timed('top n other')
+def top_n_other(frame, label, value, n, by=(), other='Other'):
+    """Keep the `n` largest `label`s by total `value` and sum the rest into an `other` label.
+
+    With `by`, the top `n` are picked within each `by` group (e.g. the largest
+    companies of every country) and each group gets its own `other` rows. The
+    remaining columns of `frame` are kept as grouping keys, so the result
+    still has one row per distinct combination of them. A false `n` keeps
+    every label.
+    """
+    if not n:
+        return frame
+    by = [by] if isinstance(by, str) else list(by)
+    keys = by + [label]
+    totals = frame.groupby(keys, sort=False)[value].sum()
+    ranks = (totals.groupby(level=by, sort=False) if by else totals).rank(method='first', ascending=False)
+    top = ranks.index[ranks <= n]
+    if by:
+        kept = pd.MultiIndex.from_frame(frame[keys]).isin(top)
+    else:
+        kept = frame[label].isin(top).to_numpy()
+    if kept.all():
+        return frame
+    bucketed = frame.copy()
+    bucketed.loc[~kept, label] = other
+    groups = [column for column in frame.columns if column != value]
+    return bucketed.groupby(groups, sort=False, as_index=False)[value].sum()
@@ -0,0 +1,189 @@
+"""Background refresh of the dataset, so no viewer waits for it.
+
+Without it the first request after the CSV changes brings the table up to
+date itself (see `missions.incremental`). A `Refresher` moves that work off
+the request path: a watchdog observer signals changes to the CSV, a worker
+thread refreshes the table and the cube, and only then publishes the result
+as a new `Version` in a single assignment. Until then every reader keeps
+getting the last published version, and if a refresh fails that version
+stays in place until the file changes again.
+
+Before publishing a version the worker also warms every cache keyed on it:
+it builds the filter index of the new cube, then renders each page
+headlessly with the loaders pinned to the new version (see
+`missions.loader.pinned`). That loads the table and cube into Streamlit's
+data cache, computes the memoized aggregates and fills the figure cache, all
+for the default filters, so the first viewer of a new version pays for none
+of it. Precomputed artifacts cannot help here, since they are keyed on the
+contents of a file that just changed.
+
+The worker also polls the file every `POLL_SECONDS`, in case the file system
+does not deliver events (e.g. network mounts).
+"""
+import collections
+import logging
+import os
+import threading
+import time
+
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+
+from missions.profiling import timed
+
+
+logger = logging.getLogger(__name__)
+
+# Whether the app refreshes the dataset in the background.
+WATCH = os.environ.get('MISSIONS_WATCH', '1') != '0'
+
+# Seconds between checks of the file when no event arrives.
+POLL_SECONDS = float(os.environ.get('MISSIONS_POLL_SECONDS', 30))
+
+# Seconds without further events before a change is picked up, so a file
+# being written is read once, at the end.
+SETTLE_SECONDS = 0.5
+
+Version = collections.namedtuple('Version', ['version', 'df', 'cube', 'modified', 'loaded'])
+Version.__doc__ = """A published state of the dataset: its version key, table and cube, file
+modification time and the time it was published."""
+
+
+def file_version(path):
+    """Cheap fingerprint of the file at `path` (see `missions.loader.dataset_version`)."""
+    stat = os.stat(path)
+    return '%d-%d' % (stat.st_mtime_ns, stat.st_size), stat.st_mtime
+
+
+class _ThreadFilter(logging.Filter):
+    # Drops the records logged by one thread.
+
+    def __init__(self, thread):
+        super().__init__()
+        self._thread = thread
+
+    def filter(self, record):
+        return record.thread != self._thread
+
+
+class _Handler(FileSystemEventHandler):
+
+    def __init__(self, path, changed):
+        self._path = path
+        self._changed = changed
+
+    def on_any_event(self, event):
+        paths = (event.src_path, getattr(event, 'dest_path', None))
+        if self._path in (os.path.abspath(path) for path in paths if path):
+            self._changed.set()
+
+
+class Refresher:
+    """Keeps an `IncrementalTable` up to date from a background thread and publishes it atomically."""
+
+    def __init__(self, table):
+        self.table = table
+        self.path = os.path.abspath(table.path)
+        self.current = None
+        self._changed = threading.Event()
+        self._refreshing = False
+        self._failed = None
+        self._observer = None
+
+    @property
+    def pending(self):
+        """True when a change was noticed but its version is not published yet."""
+        return self._changed.is_set() or self._refreshing
+
+    def start(self):
+        """Publish the current state of the dataset, then watch it for changes.
+
+        The first version is published without warming: it is loaded by
+        the request that starts the refresher anyway.
+        """
+        self._refresh(warm=False)
+        self._observer = Observer()
+        self._observer.schedule(_Handler(self.path, self._changed), os.path.dirname(self.path))
+        self._observer.daemon = True
+        self._observer.start()
+        threading.Thread(target=self._run, name='missions-refresher', daemon=True).start()
+        return self
+
+    def _run(self):
+        while True:
+            if self._changed.wait(POLL_SECONDS):
+                # Let a writer finish before reading.
+                while True:
+                    self._changed.clear()
+                    if not self._changed.wait(SETTLE_SECONDS):
+                        break
+            try:
+                self._refresh()
+            except Exception:
+                logger.exception('Refreshing %s failed, still serving version %s', self.path, self.current.version)
+
+    @timed('background refresh')
+    def _refresh(self, warm=True):
+        # The version is taken before reading, so a change made during the
+        # refresh is seen as a new version by the next one.
+        version, modified = file_version(self.path)
+        if self.current is not None and self.current.version == version or version == self._failed:
+            return
+        self._refreshing = True
+        try:
+            self._failed = version
+            self.table.refresh()
+            df, cube = self.table.state()
+
+            # Imported here: filters depends on the loader, which creates refreshers.
+            from missions.filters import cube_index
+            cube_index(cube, version)
+
+            snapshot = Version(version, df, cube, modified, time.time())
+            if warm:
+                self._warm(snapshot)
+            self.current = snapshot._replace(loaded=time.time())
+            self._failed = None
+        finally:
+            self._refreshing = False
+        logger.info('Published version %s of %s (%d missions)', version, self.path, len(df))
+
+    @timed('warm caches')
+    def _warm(self, snapshot):
+        # Imported here: these depend on the loader, which creates refreshers.
+        from missions import charts
+        from missions.loader import pinned
+        from missions.pages import PAGES, load_page
+
+        # Page content has nowhere to go from this thread, which has no
+        # ScriptRunContext; Streamlit warns about every such call.
+        quiet = _ThreadFilter(threading.get_ident())
+        context_logger = logging.getLogger('streamlit.runtime.scriptrunner.script_run_context')
+        context_logger.addFilter(quiet)
+        try:
+            with pinned(self.table.path, snapshot), charts.warming():
+                for name in PAGES:
+                    try:
+                        load_page(name).render()
+                    except Exception:
+                        logger.warning('Could not warm page %s of version %s', name, snapshot.version, exc_info=True)
+        finally:
+            context_logger.removeFilter(quiet)
+
+    def describe(self):
+        """One line on the published version and its age, for the sidebar."""
+        current = self.current
+        return 'Data version %s (%d missions), published %s ago%s' % (
+            time.strftime('%Y-%m-%d %H:%M', time.localtime(current.modified)),
+            len(current.df),
+            format_age(time.time() - current.loaded),
+            '; refreshing' if self.pending else '',
+        )
+
+
+def format_age(seconds):
+    """A short human-readable duration, e.g. '42 s', '5 min', '3 h'."""
+    for unit, size in (('d', 86400), ('h', 3600), ('min', 60)):
+        if seconds >= size:
+            return '%d %s' % (seconds // size, unit)
+    return '%d s' % seconds
@@ -0,0 +1,121 @@
+"""Columnar snapshot of the cleaned missions table.
+
+The cleaned table is written as an uncompressed Feather (Arrow IPC) file next
+to the CSV. Reading it memory-maps the file instead of parsing text, so cold
+starts skip the CSV and datetime parsing entirely. The snapshot is rebuilt
+whenever the CSV is newer than it.
+
+Build it ahead of time with::
+
+    python -m missions.snapshot
+"""
+import argparse
+import json
+import logging
+import os
+import time
+
+import pyarrow as pa
+from pyarrow import feather
+
+from missions.profiling import timed
+from missions.wrangling import DATASET_PATH, SCHEMA_VERSION, read_missions
+
+
+logger = logging.getLogger(__name__)
+
+
+def snapshot_path(csv_path=DATASET_PATH):
+    return os.path.splitext(csv_path)[0] + '.feather'
+
+
+def _schema_version(path):
+    with pa.memory_map(path) as source:
+        metadata = pa.ipc.open_file(source).schema.metadata or {}
+    return int(metadata.get(b'missions_schema', 0))
+
+
+def is_compatible(csv_path=DATASET_PATH):
+    """True when a snapshot exists and was written with the current schema, however old."""
+    path = snapshot_path(csv_path)
+    return os.path.exists(path) and _schema_version(path) == SCHEMA_VERSION
+
+
+def is_stale(csv_path=DATASET_PATH):
+    """True when the snapshot is missing, older than the CSV or from an older schema."""
+    path = snapshot_path(csv_path)
+    if not os.path.exists(path):
+        return True
+    if os.stat(csv_path).st_mtime_ns > os.stat(path).st_mtime_ns:
+        return True
+    return _schema_version(path) != SCHEMA_VERSION
+
+
+def build_snapshot(csv_path=DATASET_PATH):
+    """Parse the CSV and write the cleaned table to its snapshot file.
+
+    The file is written under a temporary name and moved into place, so
+    readers never see a partially written snapshot. Returns the cleaned frame.
+    """
+    df = read_missions(csv_path)
+    write_snapshot(df, csv_path)
+    return df
+
+
+def write_snapshot(df, csv_path=DATASET_PATH):
+    """Write an already cleaned table as the snapshot of `csv_path`.
+
+    `df.attrs['csv_state']` records which part of the CSV the table covers.
+    """
+    path = snapshot_path(csv_path)
+    tmp_path = '%s.%d.tmp' % (path, os.getpid())
+    table = pa.Table.from_pandas(df)
+    metadata = dict(table.schema.metadata)
+    metadata[b'missions_schema'] = str(SCHEMA_VERSION).encode()
+    metadata[b'missions_csv_state'] = json.dumps(df.attrs.get('csv_state')).encode()
+    feather.write_feather(table.replace_schema_metadata(metadata), tmp_path, compression='uncompressed')
+    os.replace(tmp_path, path)
+    logger.info('Wrote snapshot %s (%d rows)', path, len(df))
+
+
+@timed('read snapshot')
+def read_snapshot(csv_path=DATASET_PATH):
+    """Memory-map the snapshot of `csv_path` and return it as a DataFrame."""
+    start = time.perf_counter()
+    table = feather.read_table(snapshot_path(csv_path), memory_map=True)
+    df = table.to_pandas()
+    df.attrs['timings'] = {'snapshot': time.perf_counter() - start}
+    df.attrs['csv_state'] = json.loads(table.schema.metadata.get(b'missions_csv_state', b'null'))
+    return df
+
+
+def load_snapshot(csv_path=DATASET_PATH):
+    """Return the cleaned table, rebuilding the snapshot first if it is stale.
+
+    If the snapshot cannot be written (e.g. a read-only checkout) the freshly
+    parsed frame is returned instead.
+    """
+    if is_stale(csv_path):
+        try:
+            return build_snapshot(csv_path)
+        except OSError:
+            logger.warning('Could not write snapshot for %s, using the CSV', csv_path, exc_info=True)
+            return read_missions(csv_path)
+    return read_snapshot(csv_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('csv', nargs='?', default=DATASET_PATH, help='dataset CSV to snapshot')
+    parser.add_argument('--force', action='store_true', help='rebuild even if the snapshot is fresh')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    if args.force or is_stale(args.csv):
+        build_snapshot(args.csv)
+    else:
+        logger.info('%s is up to date', snapshot_path(args.csv))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+"""Reading and cleaning of the space missions dataset.
+
+Everything here is plain pandas so it can be used both by the Streamlit app
+and by headless scripts.
+"""
+import hashlib
+import io
+import logging
+import os
+import time
+
+import pandas as pd
+from missions.dates import add_date_features, parse_datum
+from missions.geo import resolve_locations, unresolved_locations
+from missions.profiling import stage
+
+
+logger = logging.getLogger(__name__)
+
+DATASET_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'dataset',
+    'Space_Corrected.csv'
+)
+
+# Bump whenever `clean_missions` changes the columns or dtypes it produces,
+# so derived artifacts such as the columnar snapshot get rebuilt.
+SCHEMA_VERSION = 5
+
+# Leading bytes of the CSV hashed to tell an appended file from a rewritten one.
+PREFIX_BYTES = 4096
+
+# Repeated labels, stored as categoricals with sorted categories. `country`
+# and `alpha3` are categorical too, as produced by `resolve_locations`.
+CATEGORICAL_COLUMNS = [
+    'Company Name',
+    'Location',
+    'Status Rocket',
+    'Status Mission'
+]
+
+COLUMNS = [
+    'Unnamed: 0',
+    'Unnamed: 0.1',
+    'Company Name',
+    'Location',
+    'Datum',
+    'Detail',
+    'Status Rocket',
+    'Rocket',
+    'Status Mission'
+]
+
+
+def name_columns(raw):
+    """Give a frame read from the CSV the project's column names, dropping the index columns."""
+    raw.columns = COLUMNS
+    return raw.drop(['Unnamed: 0', 'Unnamed: 0.1'], axis=1)
+
+
+def read_raw(path=DATASET_PATH):
+    """Read the CSV (a path or a file-like object) as strings, with the project's column names."""
+    return name_columns(pd.read_csv(path, dtype=str))
+
+
+def read_complete_lines(path, start=0, final=False):
+    """Read `path` from byte `start` through the end of its last complete line.
+
+    Returns the bytes and the offset just past them, so a record that is still
+    being written is left for the next read. With `final`, as for a full
+    read of the file, a last line without a newline counts as complete.
+    """
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read()
+    end = len(data) if final else data.rfind(b'\n') + 1
+    return data[:end], start + end
+
+
+def csv_state(head, size):
+    """Describe a CSV read up to byte `size`, given the first bytes of the file.
+
+    A later version of the file is an append-only extension of this one iff it
+    is at least `size` bytes long and starts with the same leading bytes.
+    """
+    return {'bytes': size, 'prefix': hashlib.sha1(head[:min(size, PREFIX_BYTES)]).hexdigest()}
+
+
+def read_head(path, size):
+    """The leading bytes of `path` that `csv_state` hashes for a file of `size` bytes."""
+    with open(path, 'rb') as f:
+        return f.read(min(size, PREFIX_BYTES))
+
+
+def clean_missions(raw):
+    """Derive the analysis columns from a raw frame returned by `read_raw`.
+
+    Rows whose `Datum` cannot be parsed are dropped with a warning.
+    """
+    df = raw.copy()
+    # Unknown prices stay missing (nullable Float64) rather than becoming 0.
+    df['Rocket'] = df['Rocket'].str.replace(',', '', regex=False).astype('Float64') * 1000000
+    with stage('parse dates'):
+        df['date'] = parse_datum(df['Datum'])
+        # A launch without a date cannot be placed on any chart, and would
+        # leave the integer calendar features without a value.
+        undated = df['date'].isna().to_numpy()
+        if undated.any():
+            logger.warning(
+                'Dropping %d missions with an unparseable Datum: %s',
+                undated.sum(), ', '.join(repr(value) for value in df['Datum'][undated].head(5))
+            )
+            df = df[~undated].reset_index(drop=True)
+        add_date_features(df)
+
+    categorize(df)
+    with stage('resolve countries'):
+        df['country'], df['alpha3'] = resolve_locations(df['Location'])
+
+    unresolved = unresolved_locations(df)
+    if len(unresolved):
+        logger.warning('No ISO alpha-3 code for %d locations: %s', len(unresolved), ', '.join(unresolved['Location']))
+    return df
+
+
+def categorize(df, columns=CATEGORICAL_COLUMNS):
+    """Convert `columns` of `df` to categoricals, in place.
+
+    Categories are the sorted distinct values, so the category order (and the
+    integer codes) only depend on the data, never on row order.
+    """
+    for column in columns:
+        categories = sorted(df[column].dropna().unique())
+        df[column] = df[column].astype(pd.CategoricalDtype(categories))
+    return df
+
+
+def read_missions(path=DATASET_PATH):
+    """Read and clean the dataset.
+
+    Stage timings are recorded in `df.attrs['timings']` and the extent of the
+    file that was read in `df.attrs['csv_state']` (see `csv_state`).
+    """
+    start = time.perf_counter()
+    with stage('read CSV'):
+        data, end = read_complete_lines(path, final=True)
+        raw = read_raw(io.BytesIO(data))
+    read_done = time.perf_counter()
+    df = clean_missions(raw)
+    done = time.perf_counter()
+    df.attrs['timings'] = {
+        'read': read_done - start,
+        'parse': done - read_done,
+        'total': done - start,
+    }
+    df.attrs['csv_state'] = csv_state(data, end)
+    return df